@@ -1,241 +1,95 @@
-import pandas as pd
 import sys
-import csv
+import os
 import random
-import textwrap
 import math
-import ambient_scene 
-
-# === GLOBAL GAME STATE ===
-
-# --- Environment & Time ---
-current_hour = 6
-hours_since_sleep = 0
-hours_walked = 0
-required_hours = None
-current_biome = {"biome_name": "Coastal Forest"}  # placeholder biome
-
-# --- Player Core Stats ---
-energy = 80
-hunger = 80
-morale = 70
-has_fire = False  # Needed to prevent crash in rest_menu()
-
-# --- Perception Stats ---
-visual_xp = 0
-auditory_xp = 0
-visual_level = 0
-auditory_level = 0
+import bisect
+import time
+from ambient_scene import describe_ambient_scene
+from narrative import TemplateSelector, compile_template
+import catalog
+from content import WEATHER_COLS, get_content
+from game_state import GameState
+from render import NullScreen, Screen, TranscriptScreen
+from weather import draw_chain
+from savegame import SaveError, SaveFile, load_game
 
 # === Load Data ===
-def load_biomes(path="data/biomes.csv"):
-    df = pd.read_csv(path)
-    # Normalize weather probabilities per row to sum to 1.0 (optional safeguard)
-    weather_cols = ['clear', 'rain', 'fog', 'storm', 'cold', 'wind']
-    df[weather_cols] = df[weather_cols].div(df[weather_cols].sum(axis=1), axis=0)
-    return df
-
-def load_items(path="data/items.csv"):
-    items = {}
-    with open(path, newline='', encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert booleans and numeric fields
-            row["identified"] = row["identified"].lower() == "true"
-            row["plant_guide_feature"] = row["plant_guide_feature"].lower() == "true"
-            row["toxicity_level"] = int(row["toxicity_level"])
-            row["hunger"] = int(row["hunger"])
-            row["morale"] = int(row["morale"])
-            row["energy"] = int(row["energy"])
-            row["min_perception_to_identify"] = int(row.get("min_perception_to_identify", 0))
-            items[row["name"]] = row
-    return items
-
-ITEM_DATA = load_items()
-
-# Load merged ambient data
-ambient_df = pd.read_csv("data/ambient_templates.csv").fillna("")
-
-def describe_ambient_scene(state):
-    """Generates an ambient message based on weather and player stats."""
-    weather = state["weather"]
-    stats = {
-        "hunger": state["hunger"],
-        "morale": state["morale"],
-        "energy": state["energy"]
-    }
-
-    # Filter by weather
-    options = ambient_df[
-        (ambient_df["weather_condition"] == "any") |
-        (ambient_df["weather_condition"] == weather)
-    ]
-
-    if options.empty:
-        return ""
-
-    row = options.sample(1).iloc[0]
-
-    base = row["base_phrase"]
-    response = row["response_phrase"]
-    modifier = ""
-
-    # Check if any stat matches this row’s modifier condition
-    for stat_name, stat_value in stats.items():
-        if row["stat_type"] == stat_name:
-            level = "low" if stat_value < 40 else "high"
-            if row["stat_level"] == level:
-                modifier = row["modifier_phrase"]
-                break
+# All tables come from the compiled content bundle (see content.py)
+CONTENT = get_content()
+ITEM_DATA = CONTENT["items"]
 
-    # Combine all parts
-    full_message = " ".join([base, modifier, response]).strip()
-    return full_message
+# Biomes and narrative templates for dynamic fill
+biome_table = CONTENT["biomes"]
+template_table = CONTENT["narrative_templates"]
+template_selector = TemplateSelector(template_table)
 
-# --- Inventory & Progress ---
-inventory = {}  # or preloaded
-narrative_history = []
+# (action_type, level) -> tuple of variations (see content.load_action_words)
+ACTION_WORDS = CONTENT["action_words"]
 
-# === Perception System ===
-player_perception = {
-    "visual": 1,
-    "auditory": 1
-}
-
-perception_xp = {
-    "visual": 0.0,
-    "auditory": 0.0
-}
-
-perception_wait_flags = {
-    "visual": False,
-    "auditory": False
-}
-
-identified_items = set()  # to track new visual ID successes
-
-# Load biomes and items
-biomes_df = load_biomes()
-ITEM_DATA = load_items()
+# === Game State ===
+# All run state lives on a GameState (see game_state.py); every action and
+# menu below takes the session's state as its first argument.
 
-# ✅ Load narrative templates for dynamic fill
-template_df = pd.read_csv("data/narrative_templates.csv")
-recent_templates = {}
+def new_game(seed=None, journal_path=None):
+    """A fresh run at the start of the first biome.
 
-# Biome traversal tracking
-current_biome_index = 0
-current_biome = biomes_df.iloc[current_biome_index]
-hours_walked = 0
-required_hours = None
+    With a journal_path, narrative older than the on-screen tail is kept
+    there instead of being dropped.
+    """
+    return GameState(biome_table, seed, journal_path=journal_path)
 
-identified_items = set()
-cooked_items = set()  # For cooking system coming later
-
-# Inventory
-inventory = {
-    "jerky": 3,
-    "flint_and_steel": 1,
-    "tinder": 1,
-    "pot": 1
-}
-identified_items.update(inventory.keys())
+def current_state(state, weather=None):
+    """The game_state dict narrative templates are filled from."""
+    return {
+        "biome": state.current_biome["biome_name"],
+        "weather": weather if weather is not None else update_weather(state),
+        "hunger": state.hunger,
+        "morale": state.morale,
+        "energy": state.energy,
+        "has_fire": state.has_fire
+    }
 
 # === Helper Functions ===
-import os
-def split_screen(permanent_history, menu_lines, max_menu=25, max_narrative=10, wrap_width=35):
-    os.system('cls' if os.name == 'nt' else 'clear')  # Clear terminal screen
-    left_width = 45
-    right_width = 45
-
-    # Wrap narrative and menu
-    wrapped_narrative = []
-    for line in permanent_history[-max_narrative:]:
-        wrapped_narrative.extend(textwrap.wrap(line, width=wrap_width) or [""])
-
-    wrapped_menu = []
-    for line in menu_lines:
-        wrapped_menu.extend(textwrap.wrap(line, width=wrap_width) or [""])
-
-    max_lines = max(len(wrapped_narrative), len(wrapped_menu))
-    for i in range(max_lines):
-        left = wrapped_narrative[i] if i < len(wrapped_narrative) else ""
-        right = wrapped_menu[i] if i < len(wrapped_menu) else ""
-        print(left.ljust(left_width) + right.ljust(right_width))
-
-class PhraseBuilder:
-    def __init__(self, game_state):
-        self.s = game_state  # shorthand
-
-    def get(self, key):
-        h = self.s['hunger']
-        m = self.s['morale']
-        e = self.s['energy']
-        w = self.s['weather']
-        fire = self.s['has_fire']
-        biome = self.s['biome']
-
-        return {
-            "hunger_level": "you’re starving" if h < 30 else "you’re a bit hungry" if h < 60 else "you feel fine",
-            "morale_reaction": "You feel bleak." if m < 30 else "You doubt yourself." if m < 60 else "You’re steady.",
-            "energy_feeling": "You move slowly." if e < 40 else "You’re still alert.",
-            "weather_feeling": {
-                "rain": "Rain clings to your gear.",
-                "fog": "The fog dulls everything.",
-                "storm": "Thunder rolls overhead.",
-                "cold": "Your breath fogs the air.",
-                "clear": "The sky is still.",
-                "wind": "Wind pushes against you."
-            }.get(w, "The weather presses in."),
-            "fire_status": "The fire burns low." if fire else "No fire. Just cold.",
-            "dream_hint": "Dreams flicker and vanish." if m < 40 else "Sleep holds nothing.",
-            "biome": biome["biome_name"] if isinstance(biome, dict) or "biome_name" in biome else str(biome)
-        }.get(key, f"<undefined:{key}>")
+terminal_screen = Screen(sys.stdout)
+
+def split_screen(permanent_history, menu_lines, max_menu=25, max_narrative=10, wrap_width=None, out=print):
+    # Sessions that print through a Screen get their own frame; plain print means this terminal.
+    # Pass static menus as tuples: they are wrapped once per width and cached.
+    screen = out if isinstance(out, Screen) else terminal_screen
+    screen.frame(permanent_history, menu_lines, max_narrative, wrap_width)
 
 def fill_template(template_string, game_state):
-    pb = PhraseBuilder(game_state)
-    while "{" in template_string:
-        start = template_string.find("{")
-        end = template_string.find("}", start)
-        key = template_string[start+1:end]
-        phrase = pb.get(key)
-        template_string = template_string[:start] + phrase + template_string[end+1:]
-    return template_string
-
-def narrative_from_template(context, game_state, max_recent=3, require_stat=False):
-    matches = template_df[template_df['context'] == context]
-
-    # If 'type' column exists, use it for filtering
-    if 'type' in matches.columns:
-        if require_stat:
-            matches = matches[matches['type'] == 'stat']
-        else:
-            matches = matches[matches['type'].isin(['universal', 'stat'])]
+    return compile_template(template_string).fill(game_state)
 
-    if matches.empty:
+def narrative_from_template(state, context, game_state, max_recent=3, require_stat=False):
+    template = template_selector.pick(context, state.recent_templates, require_stat, max_recent, state.rng)
+    if template is None:
         return "You continue in silence."
-
-    recent = recent_templates.get(context, [])
-    available = matches[~matches['template'].isin(recent)]
-    if available.empty:
-        available = matches
-
-    row = available.sample(1).iloc[0]
-    template = row['template']
-
-    # Update recent
-    recent.append(template)
-    if len(recent) > max_recent:
-        recent.pop(0)
-    recent_templates[context] = recent
-
-    return fill_template(template, game_state)
-
-def choose_word_from_csv(action_type, stat_value, df):
-    level = "low" if stat_value < 40 else "med" if stat_value < 75 else "high"
-    matches = df[(df["action_type"] == action_type) & (df["level"] == level)]
-    if not matches.empty:
-        return random.choice(matches["variation"].tolist())
-    return "[missing]"
+    return template.fill(game_state)
+
+def stat_level(stat_value):
+    return "low" if stat_value < 40 else "med" if stat_value < 75 else "high"
+
+def choose_word_from_csv(action_type, stat_value, table=ACTION_WORDS, rng=random):
+    # One dict lookup and one random() per word; no rows are filtered or copied
+    words = table.get((action_type, stat_level(stat_value)))
+    if not words:
+        return "[missing]"
+    return words[int(rng.random() * len(words))]
+
+def choose_words(requests, table=ACTION_WORDS, rng=random):
+    """choose_word_from_csv for each (action_type, stat_value) pair, in order.
+
+    For filling several verbs of one narrative at once.
+    """
+    random_ = rng.random
+    get = table.get
+    level = stat_level
+    chosen = []
+    for action_type, stat_value in requests:
+        words = get((action_type, level(stat_value)))
+        chosen.append(words[int(random_() * len(words))] if words else "[missing]")
+    return chosen
 
 def get_description(item_name, visual_level):
     item = ITEM_DATA[item_name]
@@ -251,48 +105,43 @@ def get_description(item_name, visual_level):
         else:
             return item["desc_vague"]
 
-def check_perception_levels():
-    global visual_xp, auditory_xp, visual_level, auditory_level
-    if visual_xp >= (10 + 5 * visual_level):
-        visual_xp -= (10 + 5 * visual_level)
-        visual_level += 1
-        narrative_history.append("Your vision sharpens. Visual Perception increased.")
-    if auditory_xp >= (10 + 5 * auditory_level):
-        auditory_xp -= (10 + 5 * auditory_level)
-        auditory_level += 1
-        narrative_history.append("You hear more than before. Auditory Perception increased.")
+def check_perception_levels(state):
+    if state.visual_xp >= (10 + 5 * state.visual_level):
+        state.visual_xp -= (10 + 5 * state.visual_level)
+        state.visual_level += 1
+        state.narrative_history.append("Your vision sharpens. Visual Perception increased.")
+    if state.auditory_xp >= (10 + 5 * state.auditory_level):
+        state.auditory_xp -= (10 + 5 * state.auditory_level)
+        state.auditory_level += 1
+        state.narrative_history.append("You hear more than before. Auditory Perception increased.")
 
 # === Mechanics ===
-def morale_change(amount):
-    global morale
-    morale = max(0, min(100, morale + amount))
-
-def hunger_tick():
-    global hunger
-    hunger = max(0, hunger - 2)
-
-def fatigue_tick():
-    global energy
-    energy = max(0, energy - 3)
-    if hours_since_sleep > 24:
-        morale_change(-5)
-
-def apply_effect(effect_type, value):
-    global hunger, morale, energy
+def morale_change(state, amount):
+    state.morale = max(0, min(100, state.morale + amount))
+
+def hunger_tick(state):
+    state.hunger = max(0, state.hunger - 2)
+
+def fatigue_tick(state):
+    state.energy = max(0, state.energy - 3)
+    if state.hours_since_sleep > 24:
+        morale_change(state, -5)
+
+def apply_effect(state, effect_type, value):
     if effect_type == 'food':
-        hunger = max(0, min(100, hunger + value))
+        state.hunger = max(0, min(100, state.hunger + value))
     elif effect_type == 'morale':
-        morale = max(0, min(100, morale + value))
+        state.morale = max(0, min(100, state.morale + value))
     elif effect_type == 'energy':
-        energy = max(0, min(100, energy + value))
+        state.energy = max(0, min(100, state.energy + value))
 
-def apply_effects(effects):
+def apply_effects(state, effects):
     for stat, val in effects:
-        apply_effect(stat, val)
+        apply_effect(state, stat, val)
 
-def purged_in_time():
+def purged_in_time(state):
     # 50% chance of surviving lethal poisoning
-    return random.random() < 0.5
+    return state.rng.random() < 0.5
 
 def weather_modifier(weather):
     return {
@@ -304,79 +153,57 @@ def weather_modifier(weather):
         "wind": 1.1
     }.get(weather, 1.0)
 
-def weather_effects(weather):
-    global energy #This line is required to define the global variable
-    if weather == "storm":
-        morale_change(-2)
-        narrative_history.append("The storm wears on your nerves.")
-    elif weather == "cold":
-        energy = max(0, energy - 1)
-        narrative_history.append("The cold saps your strength.")
-    elif weather == "fog":
-        morale_change(-1)
+# weather -> (morale change, energy change, narrative line or None)
+WEATHER_EFFECTS = {
+    "storm": (-2, 0, "The storm wears on your nerves."),
+    "cold": (0, -1, "The cold saps your strength."),
+    "fog": (-1, 0, None),
+}
+
+def weather_effects(state, weather):
+    effect = WEATHER_EFFECTS.get(weather)
+    if effect is None:
+        return
+    morale_delta, energy_delta, line = effect
+    if morale_delta:
+        morale_change(state, morale_delta)
+    if energy_delta:
+        state.energy = max(0, state.energy + energy_delta)
+    if line:
+        state.narrative_history.append(line)
     # You can expand this with walking penalties or fire suppression if desired
 
-def gain_perception_xp(perception_type, amount):
+def gain_perception_xp(state, perception_type, amount):
+    perception_xp = state.perception_xp
     if perception_type not in perception_xp:
         return
     perception_xp[perception_type] += amount
 
     # Level up every 3 XP (cap at 5)
     if perception_xp[perception_type] >= 3:
-        if player_perception[perception_type] < 5:
-            player_perception[perception_type] += 1
+        if state.player_perception[perception_type] < 5:
+            state.player_perception[perception_type] += 1
             perception_xp[perception_type] = 0
-            narrative_history.append(f"Your {perception_type} perception has improved.")
-            
-def reset_perception_flags():
-    for key in perception_wait_flags:
-        perception_wait_flags[key] = False
-        
-def load_items_with_perception(path="items.csv"):
-    items = {}
-    with open(path, newline='', encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            item = {
-                "name": row["name"],
-                "display_name": row["display_name"],
-                "scientific_name": row["scientific_name"],
-                "category": row["category"],
-                "lookalike_group": row["lookalike_group"],
-                "toxicity_level": int(row["toxicity_level"]),
-                "requires_cooking": row["requires_cooking"].lower() == "true",
-                "edible_raw": row["edible_raw"].lower() == "true",
-                "hunger": int(row["hunger"]),
-                "morale": int(row["morale"]),
-                "energy": int(row["energy"]),
-                "description": row["description"],
-                "biomes": row["biomes"].split(","),
-                "identified": row["identified"].lower() == "true",
-                "plant_guide_feature": row["plant_guide_feature"].lower() == "true",
-                "desc_vague": row["desc_vague"],
-                "desc_low": row["desc_low"],
-                "desc_med": row["desc_med"],
-                "desc_high": row["desc_high"],
-                "min_perception_to_identify": int(row["min_perception_to_identify"])
-            }
-            items[item["name"]] = item
-    return items
-
-            
-def camp_wait():
-    global current_hour
-    current_hour += 1
-    narrative_history.append("You wait and listen...")
-
-    if current_weather in ["fog", "storm", "wind", "night"]:
-        if not perception_wait_flags["auditory"]:
-            gain_perception_xp("auditory", 0.5)
-            perception_wait_flags["auditory"] = True
+            state.narrative_history.append(f"Your {perception_type} perception has improved.")
+
+def reset_perception_flags(state):
+    for key in state.perception_wait_flags:
+        state.perception_wait_flags[key] = False
+
+def camp_wait(state, weather):
+    state.current_hour += 1
+    state.narrative_history.append("You wait and listen...")
+
+    flags = state.perception_wait_flags
+    if weather in ["fog", "storm", "wind", "night"]:
+        if not flags["auditory"]:
+            gain_perception_xp(state, "auditory", 0.5)
+            flags["auditory"] = True
     else:
-        if not perception_wait_flags["visual"]:
-            gain_perception_xp("visual", 0.5)
-            perception_wait_flags["visual"] = True
-            
+        if not flags["visual"]:
+            gain_perception_xp(state, "visual", 0.5)
+            flags["visual"] = True
+
 def elevation_modifier(angle_deg):
     angle_rad = math.radians(angle_deg)
     return 1 + math.tan(angle_rad)
@@ -389,41 +216,98 @@ def calculate_required_hours(biome, weather, morale, energy):
     energy_mod = max(0.4, energy / 100)
     return int(base * elev_mod * weather_mod / (morale_mod * energy_mod))
 
-def update_weather():
-    weather_cols = ['clear', 'rain', 'fog', 'storm', 'cold', 'wind']
-    weights = [float(current_biome[col]) for col in weather_cols]
-    return random.choices(weather_cols, weights=weights, k=1)[0]
-
-def advance_time(hours, is_walking=False, sleep_bonus=0, rest_bonus=0, sleep_morale_bonus=0, fixed_weather=None):
-    global current_hour, hours_since_sleep, fire_hours_remaining, has_fire, energy, hunger, morale
-
-    for _ in range(hours):
-        current_hour = (current_hour + 1) % 24
-        current_weather = fixed_weather if fixed_weather else update_weather()
-        weather_effects(current_weather)
-        hours_since_sleep += 1
-
-        hunger_tick()
-        fatigue_tick()
+WEATHER_INDEX = {weather: i for i, weather in enumerate(WEATHER_COLS)}
+
+def update_weather(state):
+    return draw_weather(state, 1)[0]
+
+def draw_weather(state, hours):
+    """Hourly weather for the current biome, all drawn in one call.
+
+    Draws come from the biome's alias table (see weather.py), one
+    random() each, so this matches `hours` separate update_weather()
+    calls for the same seed. With weather persistence, each hour depends
+    on the one before, carried across calls in state.weather_index.
+    """
+    if hours <= 0:
+        return []
+    biome = state.current_biome
+    table = biome["weather_table"]
+    persistence = biome["weather_persistence"]
+    if persistence > 0:
+        last = state.weather_index
+        draws = draw_chain(table, persistence, WEATHER_COLS[last] if last >= 0 else None, state.rng, hours)
+    elif hours == 1:
+        draws = [table.draw(state.rng)]
+    else:
+        draws = table.draw_many(state.rng, hours)
+    state.weather_index = WEATHER_INDEX[draws[-1]]
+    return draws
+
+def advance_time(state, hours, is_walking=False, sleep_bonus=0, rest_bonus=0, sleep_morale_bonus=0, fixed_weather=None):
+    """Advance the clock by `hours` in one batch.
+
+    Weather for every hour is drawn up front. Hunger only ever falls with a
+    floor of 0, so it is applied in closed form; energy and morale mix
+    floors and ceilings and run through one local pass per hour, in the
+    same order as before (weather, hunger, fatigue, recovery, fire).
+    Returns the list of hourly weather.
+    """
+    if hours <= 0:
+        return []
+    weathers = [fixed_weather] * hours if fixed_weather else draw_weather(state, hours)
+
+    # Hunger: -2 per hour, -1 more while resting (not sleeping)
+    per_hour = 2 + (1 if sleep_bonus <= 0 and rest_bonus > 0 else 0)
+    state.hunger = max(0, state.hunger - per_hour * hours)
+
+    e, m = state.energy, state.morale
+    since = state.hours_since_sleep
+    burning = state.has_fire
+    fire_left = state.fire_hours_remaining if burning else None
+    effects = WEATHER_EFFECTS
+    log = state.narrative_history.append
+    for weather in weathers:
+        effect = effects.get(weather)
+        if effect is not None:
+            morale_delta, energy_delta, line = effect
+            if morale_delta:
+                m = max(0, min(100, m + morale_delta))
+            if energy_delta:
+                e = max(0, e + energy_delta)
+            if line:
+                log(line)
+
+        since += 1
+        e = max(0, e - 3)
+        if since > 24:
+            # Sleep deprivation
+            m = max(0, min(100, m - 5))
 
-        # Sleep recovery
         if sleep_bonus > 0:
-            energy = min(100, energy + sleep_bonus)
-            morale = min(100, morale + sleep_morale_bonus)
-
-        # Rest recovery
+            e = min(100, e + sleep_bonus)
+            m = min(100, m + sleep_morale_bonus)
         elif rest_bonus > 0:
-            energy = min(100, energy + rest_bonus)
-            hunger = max(0, hunger - 1)  # More hunger used while awake
-
-        if has_fire:
-            fire_hours_remaining -= 1
-            if fire_hours_remaining <= 0:
-                has_fire = False
-                narrative_history.append("The fire dies to embers.")
+            e = min(100, e + rest_bonus)
+
+        if burning:
+            fire_left -= 1
+            if fire_left <= 0:
+                burning = False
+                log("The fire dies to embers.")
+
+    state.energy, state.morale = e, m
+    state.hours_since_sleep = since
+    state.current_hour = (state.current_hour + hours) % 24
+    state.total_hours += hours
+    if fire_left is not None:
+        state.has_fire = burning
+        state.fire_hours_remaining = fire_left
+    return weathers
 
 # === Eat ===
-def eat_item():
+def eat_item(state):
+    inventory = state.inventory
     items = [i for i in inventory if inventory[i] > 0]
     if not items:
         return ["You have nothing to eat."]
@@ -431,401 +315,419 @@ def eat_item():
     # Show items and mark unidentified with question mark after count
     for idx, i in enumerate(items, 1):
         count = inventory[i]
-        suffix = "?" if i not in identified_items else ""
-        print(f"[{idx}] {i} ({count}{suffix})")
+        suffix = "?" if i not in state.identified_items else ""
+        state.out(f"[{idx}] {i} ({count}{suffix})")
 
-    choice = input("Eat which item? → ").strip()
+    choice = (yield "Eat which item? → ").strip()
     if not choice.isdigit() or not (1 <= int(choice) <= len(items)):
         return ["You put your food away."]
 
-    item_name = items[int(choice) - 1]
+    return eat(state, items[int(choice) - 1])
+
+def eat(state, item_name):
+    """Eat one of item_name from the inventory. Returns the narrative lines."""
+    inventory = state.inventory
+    if inventory.get(item_name, 0) <= 0:
+        return [f"You have no {item_name} left."]
     item = ITEM_DATA.get(item_name, {})
     inventory[item_name] -= 1
 
-    if not item.get("edible", False):
-        morale_change(-5)
-        return [f"You try to eat the {item_name}. It doesn't go well."]
-
     # === Toxicity Check ===
+    # Toxic items take effect whether or not they count as food
     toxicity = item.get("toxicity_level", 0)
-    cooked = item_name in cooked_items or not item.get("requires_cooking", False)
-
+    cooked = item_name in state.cooked_items or not item.get("requires_cooking", False)
 
     if toxicity == 1 and not cooked:
-        apply_effect("morale", -3)
-        apply_effect("energy", -3)
+        apply_effect(state, "morale", -3)
+        apply_effect(state, "energy", -3)
         return [f"You eat the {item_name}. Your stomach tightens and your head fogs."]
     elif toxicity == 2:
-        apply_effect("morale", -5)
-        apply_effect("energy", -5)
-        apply_effect("food", -5)
+        apply_effect(state, "morale", -5)
+        apply_effect(state, "energy", -5)
+        apply_effect(state, "food", -5)
         return [f"You eat the {item_name}. You feel sick — sweating, nauseated, and drained."]
     elif toxicity == 3:
-        if not purged_in_time():  # You can add this function later
+        if not purged_in_time(state):  # You can add this function later
+            state.cause_of_death = "poisoning"
             return [f"You eat the {item_name}. Moments later, the world spins. Everything fades..."]
         else:
             return [f"You eat the {item_name}, but your body violently rejects it. You might have survived."]
 
+    # Food that needs cooking can still be eaten raw, at a cost (see above)
+    if not (item.get("edible_raw", False) or item.get("requires_cooking", False)):
+        morale_change(state, -5)
+        return [f"You try to eat the {item_name}. It doesn't go well."]
+
     # === Identification System ===
-    if item_name not in identified_items:
-        if random.random() < 0.4:
+    if item_name not in state.identified_items:
+        if state.rng.random() < 0.4:
             return [f"You eat the {item_name} and feel sick."]
-        identified_items.add(item_name)
+        state.identified_items.add(item_name)
 
     # === Normal Effects ===
-    apply_effect("food", item.get("hunger", 0))
-    apply_effect("morale", item.get("morale", 0))
-    apply_effect("energy", item.get("energy", 0))
+    apply_effect(state, "food", item.get("hunger", 0))
+    apply_effect(state, "morale", item.get("morale", 0))
+    apply_effect(state, "energy", item.get("energy", 0))
 
     return [f"You eat the {item_name}. {item.get('description', '')}"]
 
 # === Travel ===
-def travel():
-    global hours_walked, required_hours, current_biome_index, current_biome
+def travel(state):
+    history = state.narrative_history
 
     # Use one consistent weather roll for both narrative + stat effects
-    weather = update_weather()
+    weather = update_weather(state)
 
     # Pull dynamic narrative using the new template system
-    narrative = narrative_from_template("travel", {
-        "biome": current_biome["biome_name"],
-        "weather": weather,
-        "hunger": hunger,
-        "morale": morale,
-        "energy": energy,
-        "has_fire": has_fire
-    })
-    narrative_history.append(narrative)
+    narrative = narrative_from_template(state, "travel", current_state(state, weather))
+    history.append(narrative)
 
     # Advance time and apply stat changes with fixed weather
-    advance_time(1, fixed_weather=weather)
-    
+    advance_time(state, 1, fixed_weather=weather)
+
     ambient = describe_ambient_scene({
-        "morale": morale,
-        "energy": energy,
-        "hunger": hunger,
+        "morale": state.morale,
+        "energy": state.energy,
+        "hunger": state.hunger,
         "weather": weather  # use the fixed weather, not current_weather
-    })
+    }, state.rng)
     if ambient:
-        narrative_history.append(ambient)
+        history.append(ambient)
 
 
     # Setup required hours if not yet initialized
-    if required_hours is None:
-        required_hours = calculate_required_hours(current_biome, weather, morale, energy)
-
-    hours_walked += 1
-    if hours_walked >= required_hours:
-        narrative_history.append("You’ve crossed the biome.")
-        current_biome_index += 1
-        if current_biome_index >= len(biomes_df):
-            narrative_history.append("You have reached the final summit.")
-            sys.exit()
+    if state.required_hours is None:
+        state.required_hours = calculate_required_hours(state.current_biome, weather, state.morale, state.energy)
+
+    state.hours_walked += 1
+    if state.hours_walked >= state.required_hours:
+        history.append("You’ve crossed the biome.")
+        state.current_biome_index += 1
+        if state.current_biome_index >= len(biome_table):
+            history.append("You have reached the final summit.")
+            state.reached_summit = True
         else:
-            current_biome = biomes_df.iloc[current_biome_index]
-            narrative_history.append(current_biome["intro_text"])
-            reset_biome_progress()
+            state.current_biome = biome_table[state.current_biome_index]
+            history.append(state.current_biome["intro_text"])
+            reset_biome_progress(state)
 
-def reset_biome_progress():
-    global hours_walked, required_hours
-    hours_walked = 0
-    required_hours = None
+def reset_biome_progress(state):
+    state.hours_walked = 0
+    state.required_hours = None
 
 # === Forage ===
-def forage():
-    global ITEM_DATA, current_biome, inventory, narrative_history
-
-    found_items = []
-
-    for item_name, item in ITEM_DATA.items():
-        # Biome filter
-        if current_biome not in item["biomes"]:
-            continue
-
-        # Rarity filter — less likely with higher rarity
-        base_chance = max(1, 6 - int(item["rarity"]))  # 1 to 5 → 5 to 1
-        roll = random.randint(1, 10)
-
-        # Apply visual perception bonus
-        perception_bonus = player_perception["visual"]
-        success = roll <= (base_chance + perception_bonus)
-
-        if success:
-            found_items.append(item)
+FORAGE_ROLL = range(1, 11)  # d10
+
+def build_forage_index(items):
+    """biome name -> (items, thresholds) for every item that grows there.
+
+    threshold is the highest d10 roll that finds the item before the
+    perception bonus: rarity 1 to 5 → 5 to 1.
+    """
+    index = {}
+    for region in items.values_of("region"):
+        rows = items.rows_where(region=region)
+        index[region] = (tuple(items.view(row) for row in rows),
+                         tuple(max(1, 6 - rarity) for rarity in items.column("rarity", rows)))
+    return index
+
+FORAGE_INDEX = build_forage_index(ITEM_DATA)
+
+def forage(state):
+    rng = state.rng
+    candidates, thresholds = FORAGE_INDEX.get(state.current_biome["biome_name"], ((), ()))
+
+    # One batch of d10 rolls for every candidate; perception shifts all thresholds
+    perception_bonus = state.player_perception["visual"]
+    rolls = rng.choices(FORAGE_ROLL, k=len(candidates))
+    found_items = [
+        item for item, threshold, roll in zip(candidates, thresholds, rolls)
+        if roll <= threshold + perception_bonus
+    ]
 
     if not found_items:
-        narrative_history.append("You searched the brush but found nothing.")
+        state.narrative_history.append("You searched the brush but found nothing.")
         return
 
     # Pick one found item at random
-    found = random.choice(found_items)
+    found = rng.choice(found_items)
     name = found["name"]
 
     # Add to inventory
-    inventory[name] = inventory.get(name, 0) + 1
+    state.inventory[name] = state.inventory.get(name, 0) + 1
 
     # Describe it
-    if name in identified_items:
-        description = found["identified_name"]
-        narrative_history.append(f"You find {description}.")
+    if name in state.identified_items:
+        state.narrative_history.append(f"You find {found['display_name']}.")
     else:
-        narrative_history.append(f"You find something: {found['description']}")
-        gain_perception_xp("visual", 1)
-        identified_items.add(name)
+        state.narrative_history.append(f"You find something: {found['description']}")
+        gain_perception_xp(state, "visual", 1)
+        state.identified_items.add(name)
 
 # === Menus ===
-def food_menu():
+def food_menu(state):
     while True:
-        split_screen(narrative_history, [
+        split_screen(state.narrative_history, (
             "[1] Eat Item",
             "[5] Back"
-        ])
-        c = input("→ ").strip()
+        ), out=state.out)
+        c = (yield "→ ").strip()
 
         if c == "1":
-            narrative_history.extend(eat_item())
-
-            game_state = {
-                "biome": current_biome["biome_name"],
-                "weather": update_weather(),
-                "hunger": hunger,
-                "morale": morale,
-                "energy": energy,
-                "has_fire": has_fire
-            }
-            narrative = narrative_from_template("eat", game_state)
-            narrative_history.append(narrative)
+            state.narrative_history.extend((yield from eat_item(state)))
+            state.narrative_history.append(narrative_from_template(state, "eat", current_state(state)))
 
         elif c == "5":
             break
 
-def rest_menu():
-    global current_hour, energy, hunger, has_fire, visual_xp, auditory_xp
+def wait_hours(state, hours):
+    """Wait at camp, one narrated hour at a time."""
+    # Draw every hour's weather at once; the hour's message and
+    # its effects use the same roll
+    for weather in draw_weather(state, hours):
+        if weather in ["fog", "wind"]:
+            state.auditory_xp += 0.3
+            narrative = f"{state.current_hour}:00 — You listen closely in the {weather}. (+0.3 auditory XP)"
+        else:
+            state.visual_xp += 0.2
+            narrative = f"{state.current_hour}:00 — You observe your surroundings. (+0.2 visual XP)"
+
+        state.narrative_history.append(narrative)
+        advance_time(state, 1, rest_bonus=2, fixed_weather=weather)
+
+def sleep_hours(state, hours):
+    state.narrative_history.append(narrative_from_template(state, "sleep", current_state(state)))
+    advance_time(state, hours, sleep_bonus=4, sleep_morale_bonus=1)
+
+MAX_REST_HOURS = 24  # longest single wait or sleep; bounds the work one input can ask for
+
+def rest_hours(duration):
+    """The hour count typed at the rest prompt, or None unless it is 1..MAX_REST_HOURS."""
+    if duration.isdigit() and 1 <= int(duration) <= MAX_REST_HOURS:
+        return int(duration)
+    return None
+
+def rest_menu(state):
     while True:
-        split_screen(narrative_history, [
+        split_screen(state.narrative_history, (
             "[1] Wait",
             "[2] Sleep",
             "[5] Back"
-        ])
-        c = input("→ ").strip()
+        ), out=state.out)
+        c = (yield "→ ").strip()
 
         if c == "1":
-            duration = input("How many hours would you like to wait? → ").strip()
-            if duration.isdigit():
-                hours = int(duration)
-
-                for i in range(hours):
-                    # Advance time by 1 hour and show message
-                    weather = update_weather()
-                    game_state = {
-                        "biome": current_biome["biome_name"],
-                        "weather": weather,
-                        "hunger": hunger,
-                        "morale": morale,
-                        "energy": energy,
-                        "has_fire": has_fire
-                    }
-
-                    if weather in ["fog", "wind"]:
-                        auditory_xp += 0.3
-                        narrative = f"{current_hour}:00 — You listen closely in the {weather}. (+0.3 auditory XP)"
-                    else:
-                        visual_xp += 0.2
-                        narrative = f"{current_hour}:00 — You observe your surroundings. (+0.2 visual XP)"
-
-                    narrative_history.append(narrative)
-                    advance_time(1, rest_bonus=2)
-
+            duration = (yield f"How many hours would you like to wait (1-{MAX_REST_HOURS})? → ").strip()
+            hours = rest_hours(duration)
+            if hours is not None:
+                wait_hours(state, hours)
+            elif duration.isdigit():
+                state.narrative_history.append(f"Invalid duration: wait 1 to {MAX_REST_HOURS} hours.")
             else:
-                narrative_history.append("You fidget, unable to rest.")
+                state.narrative_history.append("You fidget, unable to rest.")
 
         elif c == "2":
-            duration = input("How many hours would you like to sleep? → ").strip()
-            if duration.isdigit():
-                hours = int(duration)
-
-                game_state = {
-                    "biome": current_biome["biome_name"],
-                    "weather": update_weather(),
-                    "hunger": hunger,
-                    "morale": morale,
-                    "energy": energy,
-                    "has_fire": has_fire
-                }
-                narrative = narrative_from_template("sleep", game_state)
-                narrative_history.append(narrative)
-
-                advance_time(hours, sleep_bonus=4, sleep_morale_bonus=1)
+            duration = (yield f"How many hours would you like to sleep (1-{MAX_REST_HOURS})? → ").strip()
+            hours = rest_hours(duration)
+            if hours is not None:
+                sleep_hours(state, hours)
+            elif duration.isdigit():
+                state.narrative_history.append(f"Invalid duration: sleep 1 to {MAX_REST_HOURS} hours.")
             else:
-                narrative_history.append("You lie down, but can't commit to sleeping.")
+                state.narrative_history.append("You lie down, but can't commit to sleeping.")
 
         elif c == "5":
             break
 
 
-def inventory_menu():
-    print("\n  Inventory system not finished yet.")
-    input("Press Enter to return to Camp Menu.")
-    
-def notes_menu():
-    print("\n  You flip through the notes you've gathered.")
+def inventory_menu(state):
+    state.out("\n  Inventory system not finished yet.")
+    yield "Press Enter to return to Camp Menu."
+
+def notes_menu(state):
+    inventory = state.inventory
+    state.out("\n  You flip through the notes you've gathered.")
     if "note_from_stranger" in inventory and inventory["note_from_stranger"] > 0:
-        print(f"You have {inventory['note_from_stranger']} mysterious note(s) from strangers.")
+        state.out(f"You have {inventory['note_from_stranger']} mysterious note(s) from strangers.")
         # In future: display contents or prompt to read one
     else:
-        print("You haven't found any notes yet.")
-    input("\nPress Enter to return to the Camp Menu.")
+        state.out("You haven't found any notes yet.")
+    yield "\nPress Enter to return to the Camp Menu."
+
+JOURNAL_PAGE = 10
 
-def camp_menu():
+def journal_menu(state):
+    """Page back through the whole run, newest first; old pages come from the journal file."""
+    page = 0
     while True:
-        print("\n  Camp Menu")
-        print("[1] Rest")
-        print("[2] Inventory")
-        print("[3] Start Fire")
-        print("[4] Notes")
-        print("[5] Back")
+        entries = state.narrative_history.page(page, JOURNAL_PAGE)
+        split_screen(entries or ["Nothing earlier."], (
+            "[1] Older",
+            "[2] Newer",
+            "[5] Back"
+        ), max_narrative=JOURNAL_PAGE, out=state.out)
+        c = (yield "→ ").strip()
 
-        choice = input("→ ").strip().lower()
+        if c == "1" and entries:
+            page += 1
+        elif c == "2" and page > 0:
+            page -= 1
+        elif c == "5":
+            break
+
+def camp_menu(state):
+    while True:
+        state.out("\n  Camp Menu")
+        state.out("[1] Rest")
+        state.out("[2] Inventory")
+        state.out("[3] Start Fire")
+        state.out("[4] Notes")
+        state.out("[5] Back")
+
+        choice = (yield "→ ").strip().lower()
 
         if choice == "1":
-            rest_menu()
+            yield from rest_menu(state)
         elif choice == "2":
-            inventory_menu()
+            yield from inventory_menu(state)
         elif choice == "3":
-            fire_menu()  # Fire menu already handles both start/cook paths
+            yield from fire_menu(state)  # Fire menu already handles both start/cook paths
         elif choice == "4":
-            notes_menu()
+            yield from notes_menu(state)
         elif choice == "5":
             break
         else:
-            print("Invalid choice.")
+            state.out("Invalid choice.")
+
 
-        
-def fire_menu():
-    global has_fire, fire_hours_remaining
+def start_fire(state, tool):
+    """Try to light a fire with `tool`. Returns (lit, message)."""
+    if tool.replace("_", " ") == "flint and steel" and state.inventory.get("flint_and_steel", 0) > 0:
+        state.has_fire = True
+        state.fire_hours_remaining = 3
+        return True, "You strike the flint. A fire catches."
+    return False, "That won't work to start a fire. Try again."
 
-    if not has_fire:
+def tend_fire(state):
+    state.fire_hours_remaining += 2
+    return "You add fuel. Fire lasts longer now."
+
+def fire_menu(state):
+    if not state.has_fire:
         while True:
-            print("\nYou need something to start a fire.")
-            print("Inventory:")
-            valid_items = []
-            for item, qty in inventory.items():
+            state.out("\nYou need something to start a fire.")
+            state.out("Inventory:")
+            for item, qty in state.inventory.items():
                 if qty > 0:
-                    print(f"- {item} ({qty})")
-                    valid_items.append(item)
+                    state.out(f"- {item} ({qty})")
 
-            tool = input("Use what to start the fire? (or type 'back') → ").strip().lower()
+            tool = (yield "Use what to start the fire? (or type 'back') → ").strip().lower()
 
             if tool == "back":
                 return
 
-            if tool == "flint and steel" and inventory.get("flint_and_steel", 0) > 0:
-                print("You strike the flint. A fire catches.")
-                has_fire = True
-                fire_hours_remaining = 3
-                print("  Fire is now burning.")
+            lit, message = start_fire(state, tool)
+            state.out(message)
+            if lit:
+                state.out("  Fire is now burning.")
                 break
-            else:
-                print("That won't work to start a fire. Try again.")
 
     # Fire is already active → show cooking options
-    print("\n  The fire crackles.")
-    print("[1] Cook")
-    print("[2] Tend Fire")
-    print("[3] Back")
+    state.out("\n  The fire crackles.")
+    state.out("[1] Cook")
+    state.out("[2] Tend Fire")
+    state.out("[3] Back")
 
-    choice = input("→ ").strip().lower()
+    choice = (yield "→ ").strip().lower()
     if choice == "1":
-        cook_menu()
+        yield from cook_menu(state)
     elif choice == "2":
-        fire_hours_remaining += 2
-        print("You add fuel. Fire lasts longer now.")
+        state.out(tend_fire(state))
     elif choice == "3":
         return
     else:
-        print("Invalid choice.")
+        state.out("Invalid choice.")
+
+
+COOKING_METHODS = dict(zip("1234", catalog.COOKING_METHODS))  # menu key -> method
+
+def cook_menu(state):
+    inventory = state.inventory
+    cookable = [item for item in inventory if inventory[item] > 0 and ITEM_DATA[item]["requires_cooking"]]
 
-        
-def cook_menu():
-    cookable = [item for item in inventory if inventory[item] > 0 and ITEM_DATA[item]["requires_cooking"] == "True"]
-    
     if not cookable:
-        print("\nYou have nothing that needs cooking.")
+        state.out("\nYou have nothing that needs cooking.")
         return
 
-    print("\n  Choose something to cook:")
+    state.out("\n  Choose something to cook:")
     for i, item in enumerate(cookable, 1):
-        print(f"[{i}] {ITEM_DATA[item]['display_name']} ({inventory[item]})")
-    print("[5] Back")
+        state.out(f"[{i}] {ITEM_DATA[item]['display_name']} ({inventory[item]})")
+    state.out("[5] Back")
 
-    choice = input("→ ").strip()
+    choice = (yield "→ ").strip()
     if choice == "5":
         return
     if not choice.isdigit() or int(choice) < 1 or int(choice) > len(cookable):
-        print("Invalid choice.")
+        state.out("Invalid choice.")
         return
 
     raw_item = cookable[int(choice) - 1]
 
-    print("\nChoose how to cook it:")
-    print("[1] Boil (needs pot + water)")
-    print("[2] Roast (needs stick or place food near fire)")
-    print("[3] Fry (needs pot)")
-    print("[4] Steam (needs pot + water + leaves/sticks)")
-    method_choice = input("→ ").strip()
-    method_dict = {"1": "boiled", "2": "roasted", "3": "fried", "4": "steamed"}
+    state.out("\nChoose how to cook it:")
+    state.out("[1] Boil (needs pot + water)")
+    state.out("[2] Roast (needs stick or place food near fire)")
+    state.out("[3] Fry (needs pot)")
+    state.out("[4] Steam (needs pot + water + leaves/sticks)")
+    method_choice = (yield "→ ").strip()
+    method_dict = COOKING_METHODS
     if method_choice not in method_dict:
-        print("Invalid cooking method.")
+        state.out("Invalid cooking method.")
         return
 
-    method = method_dict[method_choice]
+    ok, message = cook(state, raw_item, method_dict[method_choice])
+    if not ok:
+        state.out(message)
+
+
+def cook(state, raw_item, method):
+    """Cook one raw_item by `method` (boiled/roasted/fried/steamed).
+
+    Returns (cooked, message); on success the message is also narrated.
+    """
+    inventory = state.inventory
+    if not state.has_fire:
+        return False, "You need a fire to cook."
+    if inventory.get(raw_item, 0) <= 0:
+        return False, f"You have no {raw_item} to cook."
     cooked_name = f"{method}_{raw_item}"
 
     # === Placeholder Checks ===
     if method == "boiled":
         if "pot" not in inventory:  # water requirement to be added later
-            print("You need a pot to boil.")
-            return
+            return False, "You need a pot to boil."
     elif method == "roasted":
         if "stick" not in inventory and "branch" not in inventory:
-            print("You’ll need a stick or branch to roast, or place food next to fire (not implemented yet).")
-            return
+            return False, "You’ll need a stick or branch to roast, or place food next to fire (not implemented yet)."
     elif method == "fried":
         if "pot" not in inventory:
-            print("You need a pot to fry.")
-            return
+            return False, "You need a pot to fry."
     elif method == "steamed":
         if "pot" not in inventory:
-            print("You need a pot to steam.")
-            return
+            return False, "You need a pot to steam."
         # Additional checks for water, sticks, leaves to be added
+    else:
+        return False, "Invalid cooking method."
 
     # === Cooking Time ===
     time_required = 2 if method == "roasted" else 1
-    global current_hour
-    current_hour += time_required
-    if current_hour >= 24:
-        current_hour -= 24  # wrap around
+    state.current_hour += time_required
+    if state.current_hour >= 24:
+        state.current_hour -= 24  # wrap around
+    state.total_hours += time_required
 
     # === Add Cooked Item ===
-    if cooked_name not in ITEM_DATA:
-        raw = ITEM_DATA[raw_item]
-        ITEM_DATA[cooked_name] = {
-            "display_name": f"{method.capitalize()} {raw['display_name']}",
-            "scientific_name": raw["scientific_name"],
-            "category": raw["category"],
-            "lookalike_group": raw["lookalike_group"],
-            "toxicity_level": raw["toxicity_level"],
-            "requires_cooking": "False",
-            "edible_raw": "True",
-            "hunger": str(int(raw["hunger"]) + 1),
-            "morale": str(int(raw["morale"]) + 1),
-            "energy": str(int(raw["energy"]) + 1),
-            "description": f"{method.capitalize()} version of {raw['display_name'].lower()}",
-            "region": raw["region"],
-            "identified": "True"
-        }
-
+    # The cooked variant is derived from the raw item on lookup (see catalog.py);
+    # the inventory only holds its name
     inventory[raw_item] -= 1
     if inventory[raw_item] == 0:
         del inventory[raw_item]
@@ -835,95 +737,292 @@ def cook_menu():
     else:
         inventory[cooked_name] = 1
 
-    narrative_history.append(f"You {method} the {ITEM_DATA[raw_item]['display_name'].lower()}.")
-
-
-def plant_guide_menu():
-    item["show_in_guide"] == "True"
+    message = f"You {method} the {ITEM_DATA[raw_item]['display_name'].lower()}."
+    state.narrative_history.append(message)
+    return True, message
+
+
+# === Plant Guide ===
+# Built once from the catalog: every item flagged plant_guide_feature,
+# grouped by biome (in biomes.csv order) and category, plus a case-folded
+# name -> item lookup whose sorted keys allow prefix search.
+GUIDE_CATEGORIES = ("mushroom", "fruit", "green")  # listed first, in this order
+GUIDE_MATCHES_SHOWN = 8
+
+def build_guide_index(items, biomes):
+    """(sections, lookup, keys) for the plant guide.
+
+    sections is [(biome, [(category, ((name, display_name), ...)), ...]), ...]
+    with entries sorted by display name; lookup maps a case-folded name or
+    display name to the item name; keys are the lookup's keys, sorted.
+    """
+    in_guide = items.columns["plant_guide_feature"]
+    category_of = items.columns["category"]
+    names, displays = items.columns["name"], items.columns["display_name"]
+    sections = []
+    lookup = {}
+    for biome in biomes:
+        grouped = {}
+        for row in items.rows_where(region=biome["biome_name"]):
+            if in_guide[row]:
+                grouped.setdefault(category_of[row], []).append((names[row], displays[row]))
+                lookup.setdefault(names[row].casefold(), names[row])
+                lookup.setdefault(displays[row].casefold(), names[row])
+        order = [c for c in GUIDE_CATEGORIES if c in grouped] + sorted(set(grouped) - set(GUIDE_CATEGORIES))
+        sections.append((biome["biome_name"], [
+            (category, tuple(sorted(grouped[category], key=lambda entry: entry[1].casefold())))
+            for category in order
+        ]))
+    return sections, lookup, sorted(lookup)
+
+GUIDE_SECTIONS, GUIDE_LOOKUP, GUIDE_KEYS = build_guide_index(ITEM_DATA, biome_table)
+
+def find_plants(text):
+    """Guide plants named `text` (name or display name, any case), else those starting with it."""
+    key = text.strip().casefold()
+    if not key:
+        return []
+    if key in GUIDE_LOOKUP:
+        return [GUIDE_LOOKUP[key]]
+    found = []
+    i = bisect.bisect_left(GUIDE_KEYS, key)
+    while i < len(GUIDE_KEYS) and GUIDE_KEYS[i].startswith(key):
+        name = GUIDE_LOOKUP[GUIDE_KEYS[i]]
+        if name not in found:
+            found.append(name)
+        i += 1
+    return found
+
+def plant_guide_menu(state):
     while True:
-        split_screen(narrative_history, ["Type a plant name to inspect.", "[5] Back"])
-        print("\n📖 PLANT GUIDE\n")
-
-        biomes = [
-            "Cool Damp Coast",
-            "Coastal Mountains",
-            "Temperate Rainforest Valley",
-            "Subalpine Forest",
-            "Alpine Mountain Peak"
-        ]
+        split_screen(state.narrative_history, ("Type a plant name to inspect.", "[5] Back"), out=state.out)
+        state.out("\n📖 PLANT GUIDE\n")
 
-        for biome in biomes:
-            print(f"\n== {biome.upper()} ==")
-            for cat in ["mushroom", "fruit", "green"]:
-                print(f"  — {cat.capitalize()}s —")
-                plants = [p for p in ITEM_DATA.values() if p["region"] == biome and p["category"] == cat]
-                for plant in plants:
-                    icon = "✅" if plant["name"] in identified_items else "❓"
-                    print(f"    {icon} {plant['display_name']}")
+        identified = state.identified_items
+        for biome, categories in GUIDE_SECTIONS:
+            state.out(f"\n== {biome.upper()} ==")
+            for cat, entries in categories:
+                state.out(f"  — {cat.capitalize()}s —")
+                for name, display_name in entries:
+                    icon = "✅" if name in identified else "❓"
+                    state.out(f"    {icon} {display_name}")
 
-        c = input("\nEnter plant name or [5] to go back → ").strip().lower()
+        c = (yield "\nEnter plant name or [5] to go back → ").strip().lower()
 
         if c == "5":
             break
 
-        # Try to find plant by internal or display name
-        match = next(
-            (p for p in ITEM_DATA.values()
-             if p["name"] == c or p["display_name"].lower() == c), None)
+        # Match the internal or display name, or failing that the start of one
+        matches = find_plants(c)
 
-        if not match:
-            narrative_history.append(f"No plant named '{c}' found.")
+        if not matches:
+            state.narrative_history.append(f"No plant named '{c}' found.")
+        elif len(matches) > 1:
+            shown = ", ".join(ITEM_DATA.value(name, "display_name") for name in matches[:GUIDE_MATCHES_SHOWN])
+            more = f" and {len(matches) - GUIDE_MATCHES_SHOWN} more" if len(matches) > GUIDE_MATCHES_SHOWN else ""
+            state.narrative_history.append(f"Several plants match '{c}': {shown}{more}.")
         else:
-            print("\n--- PLANT INFO ---")
-            print(f"Name       : {match['display_name']}")
-            print(f"Type       : {match['category'].capitalize()}")
-            print(f"Scientific : {match['scientific_name']}")
-            print(f"Biome      : {match['region']}")
-            print(f"Description: {match['description']}")
-            print(f"Toxicity   : {match['toxicity_level']}")
-            tox_index = int(match["toxicity_level"])
-            tox_label = ["Safe", "Slightly Toxic", "Moderately Toxic", "Lethal Toxic"][tox_index]
-
-            input("\nPress Enter to return to the guide.")
+            match = ITEM_DATA[matches[0]]
+            state.out("\n--- PLANT INFO ---")
+            state.out(f"Name       : {match['display_name']}")
+            state.out(f"Type       : {match['category'].capitalize()}")
+            state.out(f"Scientific : {match['scientific_name']}")
+            state.out(f"Biome      : {match['region']}")
+            state.out(f"Description: {match['description']}")
+            state.out(f"Toxicity   : {match['toxicity_level']}")
+
+            yield "\nPress Enter to return to the guide."
 
 # === Main Menu ===
-def main_menu():
+def main_menu(state):
     while True:
-        if hunger <= 0 or energy <= 0:
-            print("You collapse. Game over.")
-            sys.exit()
+        status = state.status()
+        if status == "summit":
+            state.out("You have reached the final summit.")
+            return
+        if status:
+            state.out("You collapse. Game over.")
+            return
         menu = [
             "=== STATUS ===",
-            f"Biome   : {current_biome['biome_name']}",
-            f"Time    : {str(current_hour).zfill(2)}:00",
-            f"Hunger  : {hunger}/100",
-            f"Energy  : {energy}/100",
-            f"Morale  : {morale}/100",
-            f"Progress: {hours_walked}/{required_hours or '?'} hrs",
+            f"Biome   : {state.current_biome['biome_name']}",
+            f"Time    : {str(state.current_hour).zfill(2)}:00",
+            f"Hunger  : {state.hunger}/100",
+            f"Energy  : {state.energy}/100",
+            f"Morale  : {state.morale}/100",
+            f"Progress: {state.hours_walked}/{state.required_hours or '?'} hrs",
             "--- Perception ---",
-            f"Visual  : Lv {visual_level}  XP: {visual_xp}",
-            f"Auditory: Lv {auditory_level}  XP: {auditory_xp}",
+            f"Visual  : Lv {state.visual_level}  XP: {state.visual_xp}",
+            f"Auditory: Lv {state.auditory_level}  XP: {state.auditory_xp}",
             "==============",
             "[1] Eat",
             "[2] Travel",
-            "[3] Camp"
+            "[3] Camp",
+            "[4] Journal"
         ]
-        split_screen(narrative_history, menu)
-        choice = input("→ ").strip().lower()
+        split_screen(state.narrative_history, menu, out=state.out)
+        choice = (yield "→ ").strip().lower()
         if choice in ["1", "eat"]:
-            food_menu()
+            yield from food_menu(state)
         elif choice in ["2", "travel", "walk"]:
-            travel()
+            travel(state)
         elif choice in ["3", "camp"]:
-            camp_menu()
+            yield from camp_menu(state)
+        elif choice in ["4", "journal"]:
+            yield from journal_menu(state)
         else:
-            narrative_history.append("You hesitate, unsure what to do.")
+            state.narrative_history.append("You hesitate, unsure what to do.")
 
 # === Game Start ===
+# Menus are generators: they print through state.out and `yield` each prompt,
+# receiving the player's line back. Any front end can drive them — the
+# terminal or a script of lines below, or a socket server (see server.py).
+
+# Next to this file, whatever directory the game is started from
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+SAVE_PATH = os.path.join(GAME_DIR, "savegame.trpg")     # autosaved after every input; resumed on the next start
+REPLAY_PATH = os.path.join(GAME_DIR, "lastrun.replay")  # this run's inputs, for bug reports (see replay.py)
+JOURNAL_PATH = os.path.join(GAME_DIR, "savegame.journal.gz")  # the save's older narrative; goes with it
+
+def run_terminal(menu, after_input=None):
+    """Drive a menu generator from stdin/stdout until it finishes.
+
+    after_input(line) runs after each line is handled, even the one that
+    ends the game or raises.
+    """
+    try:
+        prompt = next(menu)
+        while True:
+            line = input(prompt)
+            try:
+                prompt = menu.send(line)
+            finally:
+                if after_input:
+                    after_input(line)
+    except (StopIteration, EOFError):
+        pass
+
+def run_script(menu, lines, after_input=None, echo=None):
+    """Drive a menu generator from any iterable of lines, without waiting on a terminal.
+
+    echo(prompt, line) sees each exchange, e.g. to write a transcript.
+    Returns (lines handled, whether the game ended).
+    """
+    handled = 0
+    try:
+        prompt = next(menu)
+        for line in lines:
+            if echo:
+                echo(prompt, line)
+            handled += 1
+            try:
+                prompt = menu.send(line)
+            finally:
+                if after_input:
+                    after_input(line)
+    except StopIteration:
+        return handled, True
+    finally:
+        menu.close()
+    return handled, False
+
+def script_lines(path):
+    """Input lines from a file, or from stdin for "-"."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in f:
+            yield line.rstrip("\r\n")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def resume_or_new_game():
+    if os.path.exists(SAVE_PATH):
+        try:
+            state = load_game(SAVE_PATH, biome_table, JOURNAL_PATH)
+        except SaveError as e:
+            print(f"Could not load the saved game ({e}); starting a new one.")
+        else:
+            if state.status() is None:
+                state.narrative_history.append("You pick up where you left off.")
+                return state
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)  # belongs to the save being replaced
+    state = new_game(journal_path=JOURNAL_PATH)
+    state.narrative_history.append("")
+    return state
+
+def scripted_main(args):
+    """Play a script of input lines as fast as the engine goes, then report the rate."""
+    state = new_game(args.seed)
+    transcript = open(args.transcript, "w", encoding="utf-8") if args.transcript else None
+    state.out = TranscriptScreen(transcript) if transcript else NullScreen()
+    echo = (lambda prompt, line: transcript.write(f"{prompt}{line}\n")) if transcript else None
+    after_input = None
+    if args.record:
+        from replay import ActionRecorder
+        recorder = ActionRecorder(args.record, state)
+        after_input = lambda line: recorder.record(line, state)
+
+    start = time.perf_counter()
+    try:
+        handled, ended = run_script(main_menu(state), script_lines(args.script), after_input, echo)
+    finally:
+        if args.record:
+            recorder.close()
+        if transcript:
+            transcript.close()
+        state.narrative_history.close()
+    elapsed = time.perf_counter() - start
+
+    rate = handled / elapsed if elapsed else 0
+    print(f"Handled {handled} inputs in {elapsed * 1000:.1f} ms ({rate:,.0f} actions/s)")
+    print(f"Status: {state.status() or ('script ended' if not ended else 'game over')}, "
+          f"{state.total_hours} hours, biome {state.current_biome_index + 1}/{len(biome_table)}")
+
 def main():
-    global narrative_history
-    narrative_history = [""]
-    main_menu()
+    import argparse
+    parser = argparse.ArgumentParser(description="A survival text RPG.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="play these input lines (one per line, - for stdin) instead of the keyboard")
+    parser.add_argument("--seed", type=int, help="seed a scripted run, for repeatable results")
+    parser.add_argument("--transcript", metavar="FILE", help="write a scripted run's screens and inputs here")
+    parser.add_argument("--record", metavar="FILE", help="record a scripted run as a replay log")
+    args = parser.parse_args()
+    if args.script:
+        scripted_main(args)  # never touches the autosave
+        return
+
+    from replay import ActionRecorder  # replay.py imports this module
+    state = resume_or_new_game()
+    state.out = terminal_screen
+    save = SaveFile(SAVE_PATH, state)
+    recorder = ActionRecorder(REPLAY_PATH, state)
+
+    def after_input(line):
+        save.save(state)
+        recorder.record(line, state)
+
+    menu = main_menu(state)
+    profile = os.environ.get("TEXTRPG_PROFILE")  # "1" for a table at exit, or a .json path
+    if profile:
+        import instrument
+        profiler = instrument.install(sys.modules[__name__])
+        menu = instrument.timed_menu(menu)
+    try:
+        run_terminal(menu, after_input)
+    finally:
+        save.close()
+        recorder.close()
+        if profile:
+            print(profiler.table())
+            if profile.endswith(".json"):
+                profiler.dump(profile)
+        state.narrative_history.close()
+        if state.status() is not None:
+            os.remove(SAVE_PATH)  # the run is over; nothing to resume
+            if os.path.exists(JOURNAL_PATH):
+                os.remove(JOURNAL_PATH)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,51 +1,87 @@
-import pandas as pd
 import random
+from bisect import bisect
+from itertools import accumulate
+from content import get_content
 
-# === Load CSVs ===
-ambient_base = pd.read_csv("data/ambient_base.csv")     # includes base_phrase, category, weather_condition
-ambient_mod  = pd.read_csv("data/ambient_modifier.csv") # includes stat_type, stat_level, modifier_phrase
-ambient_resp = pd.read_csv("data/ambient_response.csv") # includes category, response_phrase
+# === Load Tables ===
+content = get_content()
+ambient_base = content["ambient_base"]     # includes base_phrase, category, weather_condition
+ambient_mod  = content["ambient_modifier"] # includes stat_type, stat_level, modifier_phrase
+ambient_resp = content["ambient_response"] # includes category, response_phrase
 
-def describe_ambient_scene(state):
+LOW_STAT = 40
+
+class AmbientEngine:
+    """Composes ambient lines from the base, modifier and response tables.
+
+    Lines are drawn with the same distribution as a uniform pick from the
+    full base x modifier x response cross-product (responses joined on
+    category), without ever building it:
+      - base: weighted by the number of responses in its category
+      - response: uniform within the base's category
+      - modifier: uniform over all modifiers, shown only when the player's
+        stat is at that modifier's level
+    """
+
+    def __init__(self, bases, modifiers, responses):
+        self.responses = {}
+        for row in responses:
+            self.responses.setdefault(row["category"], []).append(row["response_phrase"])
+        self.responses = {cat: tuple(phrases) for cat, phrases in self.responses.items()}
+
+        self.modifiers = tuple(
+            (row["stat_type"], row["stat_level"], row["modifier_phrase"]) for row in modifiers
+        )
+
+        # weather -> (entries, cumulative weights); entry = (base_phrase, responses)
+        any_weather = []
+        by_weather = {}
+        for row in bases:
+            responses_for_base = self.responses.get(row["category"], ())
+            if not responses_for_base:
+                continue  # no cross-product rows for this base
+            entry = (row["base_phrase"], responses_for_base)
+            if row["weather_condition"] == "any":
+                any_weather.append(entry)
+            else:
+                by_weather.setdefault(row["weather_condition"], []).append(entry)
+        self.any_weather = self._candidates(any_weather)
+        self.bases_by_weather = {
+            w: self._candidates(any_weather + entries) for w, entries in by_weather.items()
+        }
+
+    @staticmethod
+    def _candidates(entries):
+        return tuple(entries), tuple(accumulate(len(responses) for _, responses in entries))
+
+    def describe(self, state, rng=random):
+        """Generate one ambient message from weather and stats."""
+        bases, cum_weights = self.bases_by_weather.get(state["weather"], self.any_weather)
+        if not bases:
+            return ""
+        base_phrase, responses = bases[bisect(cum_weights, rng.random() * cum_weights[-1])]
+        parts = [base_phrase]
+
+        if self.modifiers:
+            stat_type, level, phrase = self.modifiers[rng.randrange(len(self.modifiers))]
+            value = state.get(stat_type)
+            if value is not None and level == ("low" if value < LOW_STAT else "high"):
+                parts.append(phrase)
+
+        parts.append(responses[rng.randrange(len(responses))])
+        return " ".join(parts)
+
+    def describe_many(self, states, rng=random):
+        """One ambient message per state, in order."""
+        describe = self.describe
+        return [describe(state, rng) for state in states]
+
+engine = AmbientEngine(ambient_base, ambient_mod, ambient_resp)
+
+def describe_ambient_scene(state, rng=random):
     """Generate an ambient message based on weather and stats."""
-    w = state["weather"]
-    h = state["hunger"]
-    e = state["energy"]
-    m = state["morale"]
-
-    # Step 1: Filter base ambient by weather
-    base_options = ambient_base[(ambient_base["weather_condition"] == "any") | 
-                                 (ambient_base["weather_condition"] == w)]
-
-    if base_options.empty:
-        return ""
-
-    base_row = base_options.sample(1).iloc[0]
-    base_phrase = base_row["base_phrase"]
-    category = base_row["category"]
-
-    # Step 2: Add a modifier based on stat
-    stat_choices = []
-    if h < 40:
-        stat_choices.append(("hunger", h))
-    if m < 40:
-        stat_choices.append(("morale", m))
-    if e < 40:
-        stat_choices.append(("energy", e))
-
-    modifier_phrase = ""
-    if stat_choices:
-        stat_type, val = random.choice(stat_choices)
-        level = "low" if val < 40 else "high"
-        mod = ambient_mod[(ambient_mod["stat_type"] == stat_type) & (ambient_mod["stat_level"] == level)]
-        if not mod.empty:
-            modifier_phrase = mod.sample(1).iloc[0]["modifier_phrase"]
-
-    # Step 3: Add response
-    resp_options = ambient_resp[ambient_resp["category"] == category]
-    if not resp_options.empty:
-        response_phrase = resp_options.sample(1).iloc[0]["response_phrase"]
-    else:
-        response_phrase = ""
-
-    return " ".join([base_phrase, modifier_phrase, response_phrase]).strip()
+    return engine.describe(state, rng)
+
+def describe_ambient_scenes(states, rng=random):
+    """Batch version of describe_ambient_scene: one message per session state."""
+    return engine.describe_many(states, rng)
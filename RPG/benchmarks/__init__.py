@@ -0,0 +1,4 @@
+# Run benchmarks from the RPG directory, e.g.:
+#   python -m benchmarks.bench_templates
+# or the whole suite against the stored baseline:
+#   python -m benchmarks.run
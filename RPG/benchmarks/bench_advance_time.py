@@ -0,0 +1,77 @@
+from benchmarks.harness import measure, report
+
+import random
+import RPGTEST8 as game
+
+STATE = ("current_hour", "hours_since_sleep", "hunger", "energy", "morale", "has_fire", "fire_hours_remaining",
+         "weather_index")
+
+def legacy_advance_time(g, hours, sleep_bonus=0, rest_bonus=0, sleep_morale_bonus=0, fixed_weather=None):
+    """The old hour-by-hour loop, driving the game's own helpers."""
+    for _ in range(hours):
+        g.current_hour = (g.current_hour + 1) % 24
+        current_weather = fixed_weather if fixed_weather else game.update_weather(g)
+        game.weather_effects(g, current_weather)
+        g.hours_since_sleep += 1
+        game.hunger_tick(g)
+        game.fatigue_tick(g)
+        if sleep_bonus > 0:
+            g.energy = min(100, g.energy + sleep_bonus)
+            g.morale = min(100, g.morale + sleep_morale_bonus)
+        elif rest_bonus > 0:
+            g.energy = min(100, g.energy + rest_bonus)
+            g.hunger = max(0, g.hunger - 1)
+        if g.has_fire:
+            g.fire_hours_remaining -= 1
+            if g.fire_hours_remaining <= 0:
+                g.has_fire = False
+                g.narrative_history.append("The fire dies to embers.")
+
+SEEDS = {}  # seed -> generator state, so timed resets skip reseeding
+
+def reset(state, seed, stats):
+    if seed not in SEEDS:
+        SEEDS[seed] = random.Random(seed).getstate()
+    state.rng.setstate(SEEDS[seed])
+    state.narrative_history = []
+    for name, value in zip(STATE, stats):
+        setattr(state, name, value)
+
+def snapshot(state):
+    return tuple(getattr(state, name) for name in STATE) + (tuple(state.narrative_history),)
+
+def check_equivalence():
+    state = game.new_game()
+    cases = [dict(), dict(sleep_bonus=4, sleep_morale_bonus=1), dict(rest_bonus=2), dict(fixed_weather="storm")]
+    starts = [(6, 0, 80, 80, 70, False, 0, -1), (23, 20, 10, 5, 3, True, 3, 2), (0, 30, 100, 100, 100, True, 1, -1)]
+    for seed in range(50):
+        for stats in starts:
+            for kwargs in cases:
+                for hours in (0, 1, 8, 24, 72):
+                    reset(state, seed, stats)
+                    legacy_advance_time(state, hours, **kwargs)
+                    expected = snapshot(state)
+                    reset(state, seed, stats)
+                    game.advance_time(state, hours, **kwargs)
+                    assert snapshot(state) == expected, (seed, stats, kwargs, hours)
+
+def main():
+    check_equivalence()
+    start = (6, 0, 80, 80, 70, True, 3, -1)
+    state = game.new_game()
+    for hours in (1, 8, 24):
+        def run_legacy():
+            reset(state, 1, start)
+            legacy_advance_time(state, hours, sleep_bonus=4, sleep_morale_bonus=1)
+
+        def run_batched():
+            reset(state, 1, start)
+            game.advance_time(state, hours, sleep_bonus=4, sleep_morale_bonus=1)
+
+        report(f"advance_time({hours}) while sleeping", [
+            ("legacy per-hour loop", measure(run_legacy, number=5000)),
+            ("batched", measure(run_batched, number=5000)),
+        ])
+
+if __name__ == "__main__":
+    main()
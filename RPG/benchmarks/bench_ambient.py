@@ -0,0 +1,120 @@
+from benchmarks.harness import measure, report
+
+import random
+from collections import Counter
+import ambient_scene
+
+try:
+    import pandas as pd
+except ImportError:  # legacy comparisons are skipped
+    pd = None
+
+# === Legacy implementations ===
+def cross_product_rows(bases, modifiers, responses):
+    """The base x modifier x response expansion ambient_templates.csv used to hold."""
+    return [
+        {"base_phrase": b["base_phrase"], "weather_condition": b["weather_condition"],
+         "category": b["category"], "modifier_phrase": m["modifier_phrase"],
+         "stat_type": m["stat_type"], "stat_level": m["stat_level"],
+         "response_phrase": r["response_phrase"]}
+        for b in bases for m in modifiers for r in responses if r["category"] == b["category"]
+    ]
+
+def cross_product_line(rows, state, rng):
+    """Uniform pick from the cross-product, as the old RPGTEST8 version did."""
+    options = [r for r in rows if r["weather_condition"] in ("any", state["weather"])]
+    if not options:
+        return ""
+    row = options[rng.randrange(len(options))]
+    parts = [row["base_phrase"]]
+    level = "low" if state[row["stat_type"]] < 40 else "high"
+    if row["stat_level"] == level:
+        parts.append(row["modifier_phrase"])
+    parts.append(row["response_phrase"])
+    return " ".join(parts)
+
+def legacy_cross_product_scene(ambient_df, state):
+    """The old RPGTEST8 version over the cross-product DataFrame."""
+    weather = state["weather"]
+    stats = {"hunger": state["hunger"], "morale": state["morale"], "energy": state["energy"]}
+    options = ambient_df[(ambient_df["weather_condition"] == "any") |
+                         (ambient_df["weather_condition"] == weather)]
+    if options.empty:
+        return ""
+    row = options.sample(1).iloc[0]
+    modifier = ""
+    for stat_name, stat_value in stats.items():
+        if row["stat_type"] == stat_name:
+            level = "low" if stat_value < 40 else "high"
+            if row["stat_level"] == level:
+                modifier = row["modifier_phrase"]
+                break
+    return " ".join([row["base_phrase"], modifier, row["response_phrase"]]).strip()
+
+def legacy_filtered_scene(ambient_base, ambient_mod, ambient_resp, state):
+    """The old ambient_scene version: three pandas filters and samples."""
+    w, h, e, m = state["weather"], state["hunger"], state["energy"], state["morale"]
+    base_options = ambient_base[(ambient_base["weather_condition"] == "any") |
+                                (ambient_base["weather_condition"] == w)]
+    if base_options.empty:
+        return ""
+    base_row = base_options.sample(1).iloc[0]
+    stat_choices = []
+    if h < 40:
+        stat_choices.append(("hunger", h))
+    if m < 40:
+        stat_choices.append(("morale", m))
+    if e < 40:
+        stat_choices.append(("energy", e))
+    modifier_phrase = ""
+    if stat_choices:
+        stat_type, val = random.choice(stat_choices)
+        level = "low" if val < 40 else "high"
+        mod = ambient_mod[(ambient_mod["stat_type"] == stat_type) & (ambient_mod["stat_level"] == level)]
+        if not mod.empty:
+            modifier_phrase = mod.sample(1).iloc[0]["modifier_phrase"]
+    resp_options = ambient_resp[ambient_resp["category"] == base_row["category"]]
+    response_phrase = resp_options.sample(1).iloc[0]["response_phrase"] if not resp_options.empty else ""
+    return " ".join([base_row["base_phrase"], modifier_phrase, response_phrase]).strip()
+
+# === Benchmark ===
+def main():
+    weathers = ["clear", "rain", "fog", "storm", "cold", "wind"]
+    rng = random.Random(7)
+    states = [
+        {"weather": rng.choice(weathers), "hunger": rng.randint(0, 100),
+         "morale": rng.randint(0, 100), "energy": rng.randint(0, 100)}
+        for _ in range(1000)
+    ]
+    state = {"weather": "wind", "hunger": 20, "morale": 35, "energy": 80}
+    engine = ambient_scene.engine
+
+    bases = list(ambient_scene.ambient_base)
+    modifiers = list(ambient_scene.ambient_mod)
+    responses = list(ambient_scene.ambient_resp)
+    expanded = cross_product_rows(bases, modifiers, responses)
+
+    # Composed lines must follow the cross-product's distribution
+    draws = 200000
+    for check in [state, {"weather": "fog", "hunger": 90, "morale": 10, "energy": 45}]:
+        composed = Counter(engine.describe(check, rng) for _ in range(draws))
+        expected = Counter(cross_product_line(expanded, check, rng) for _ in range(draws))
+        for line in composed.keys() | expected.keys():
+            assert abs(composed[line] - expected[line]) / draws < 0.01, line
+
+    rows = []
+    if pd is not None:
+        ambient_df = pd.DataFrame(expanded)
+        frames = (ambient_scene.ambient_base.to_dataframe(), ambient_scene.ambient_mod.to_dataframe(),
+                  ambient_scene.ambient_resp.to_dataframe())
+        rows.append(("legacy cross-product DataFrame", measure(
+            lambda: legacy_cross_product_scene(ambient_df, state), number=300)))
+        rows.append(("legacy three pandas filters", measure(
+            lambda: legacy_filtered_scene(*frames, state), number=300)))
+    rows.append(("indexed engine, one line", measure(lambda: engine.describe(state), number=20000)))
+    rows.append(("indexed engine, batch of 1000 / 1000",
+                 measure(lambda: engine.describe_many(states), number=50) / len(states)))
+    report("describe_ambient_scene", rows)
+
+if __name__ == "__main__":
+    main()
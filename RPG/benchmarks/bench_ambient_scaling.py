@@ -0,0 +1,114 @@
+"""Memory and load time of the ambient content as the tables grow.
+
+Compares the old pre-expanded cross-product file (base x modifier x
+response) with the three normalized tables composed at runtime. Synthetic
+tables are written to a temp directory; cross-products too large to
+materialize are extrapolated from the largest measured size.
+
+    python -m benchmarks.bench_ambient_scaling [--sizes 10 100 1000 5000]
+"""
+# Imported for its side effect: chdir to RPG/ and put it on sys.path
+import benchmarks.harness  # noqa: F401
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from ambient_scene import AmbientEngine
+
+WEATHERS = ["any", "clear", "rain", "fog", "storm", "cold", "wind"]
+CATEGORIES = 10
+MAX_EXPANDED_ROWS = 200000
+
+def write_csv(path, fieldnames, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def synthetic_tables(n):
+    bases = [{"id": f"amb_{i}", "category": f"cat_{i % CATEGORIES}",
+              "base_phrase": f"Base phrase number {i} drifts through the trees.",
+              "weather_condition": WEATHERS[i % len(WEATHERS)]} for i in range(n)]
+    modifiers = [{"id": f"mod_{i}", "stat_type": ["hunger", "morale", "energy"][i % 3],
+                  "stat_level": ["low", "high"][i % 2],
+                  "modifier_phrase": f"Modifier phrase {i} colors how you take it."} for i in range(n)]
+    responses = [{"id": f"res_{i}", "category": f"cat_{i % CATEGORIES}",
+                  "response_phrase": f"Response phrase {i} lets the moment pass."} for i in range(n)]
+    return bases, modifiers, responses
+
+def expanded_row_count(n):
+    return n * n * (n // CATEGORIES)
+
+def measure_load(load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100, 1000, 5000],
+                        help="phrases per table")
+    args = parser.parse_args()
+
+    per_row = None  # (bytes on disk, bytes in memory, seconds to load) per expanded row
+    print(f"{'phrases':>8} {'expanded rows':>14} | {'cross-product file / RAM / load':>36} | "
+          f"{'normalized files / RAM / load':>34}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            bases, modifiers, responses = synthetic_tables(n)
+            paths = [os.path.join(tmp, f"{name}_{n}.csv") for name in ("base", "modifier", "response")]
+            for path, rows in zip(paths, (bases, modifiers, responses)):
+                write_csv(path, list(rows[0]), rows)
+
+            def load_normalized():
+                return AmbientEngine(*(read_csv(p) for p in paths))
+
+            _, norm_time, norm_mem = measure_load(load_normalized)
+            norm_disk = sum(os.path.getsize(p) for p in paths)
+
+            rows = expanded_row_count(n)
+            if rows <= MAX_EXPANDED_ROWS:
+                by_cat = {}
+                for r in responses:
+                    by_cat.setdefault(r["category"], []).append(r)
+                expanded_path = os.path.join(tmp, f"ambient_templates_{n}.csv")
+                write_csv(expanded_path, ["base_phrase", "weather_condition", "category", "modifier_phrase",
+                                          "stat_type", "stat_level", "response_phrase"], (
+                    {"base_phrase": b["base_phrase"], "weather_condition": b["weather_condition"],
+                     "category": b["category"], "modifier_phrase": m["modifier_phrase"],
+                     "stat_type": m["stat_type"], "stat_level": m["stat_level"],
+                     "response_phrase": r["response_phrase"]}
+                    for b in bases for m in modifiers for r in by_cat.get(b["category"], ())
+                ))
+                _, exp_time, exp_mem = measure_load(lambda: read_csv(expanded_path))
+                exp_disk = os.path.getsize(expanded_path)
+                if rows:
+                    per_row = (exp_disk / rows, exp_mem / rows, exp_time / rows)
+                mark = " "
+            elif per_row is not None:
+                exp_disk, exp_mem, exp_time = (v * rows for v in per_row)
+                mark = "~"  # extrapolated
+            else:
+                print(f"{n:>8} {rows:>14,} | (no measured size to extrapolate from)")
+                continue
+
+            print(f"{n:>8} {rows:>14,} |{mark}{exp_disk / 1e6:>11.1f} MB {exp_mem / 1e6:>9.1f} MB "
+                  f"{exp_time:>9.3f} s | {norm_disk / 1e6:>9.2f} MB {norm_mem / 1e6:>9.2f} MB "
+                  f"{norm_time:>9.4f} s | saves {(exp_mem - norm_mem) / 1e6:,.1f} MB, "
+                  f"{exp_time - norm_time:,.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Item catalog at scale: memory and query time of the columnar catalog vs a dict of dicts.
+
+items.csv is repeated with unique names up to --items rows, parsed the
+way load_items parses it, and held both ways. Queries are checked to give
+the same answers as a scan over the dicts. Cooking every item every way
+shows memory for cooked variants: stored as catalog entries, as cook()
+used to, or derived on lookup through the bounded cache.
+
+    python -m benchmarks.bench_catalog [--items 100000]
+"""
+from benchmarks.harness import measure, report
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import content
+from catalog import COOKED_CACHE_SIZE, COOKING_METHODS, ItemCatalog
+
+def scaled_csv(path, count):
+    """items.csv repeated up to `count` rows; names and display names made unique."""
+    with open(os.path.join(content.DATA_DIR, "items.csv"), encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(header + "\n")
+        for i in range(count):
+            name, display, rest = rows[i % len(rows)].split(",", 2)
+            out.write(f"{name}_{i},{display} {i},{rest}\n")
+
+def load_dicts(path):
+    """The old ITEM_DATA: load_items' row dicts, kept as they are."""
+    catalog_rows = []
+
+    class Collect(ItemCatalog):
+        def add(self, row):
+            catalog_rows.append(row)
+
+    original = content.ItemCatalog
+    content.ItemCatalog = Collect
+    try:
+        content.load_items(path)
+    finally:
+        content.ItemCatalog = original
+    return {row["name"]: row for row in catalog_rows}
+
+def traced(build):
+    """(result, bytes still allocated by build())."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+QUERIES = {
+    "region": dict(region="Subalpine Forest"),
+    "region + category": dict(region="Subalpine Forest", category="mushroom"),
+    "lookalike group": dict(lookalike_group="amanita"),
+    "toxicity >= 2": dict(min_toxicity=2),
+    "region + safe": dict(region="Coastal Mountains", max_toxicity=0),
+}
+
+def scan(items, region=None, category=None, lookalike_group=None, min_toxicity=None, max_toxicity=None):
+    """The same query over dicts, as the game used to filter ITEM_DATA.values()."""
+    return [
+        item["name"] for item in items.values()
+        if (region is None or item["region"] == region)
+        and (category is None or item["category"] == category)
+        and (lookalike_group is None or item["lookalike_group"] == lookalike_group)
+        and (min_toxicity is None or item["toxicity_level"] >= min_toxicity)
+        and (max_toxicity is None or item["toxicity_level"] <= max_toxicity)
+    ]
+
+def stored_cooked(catalog, name, method):
+    """A cooked variant added to the catalog, as cook() used to."""
+    raw = catalog[name]
+    catalog.add({
+        "name": f"{method}_{name}", "display_name": f"{method.capitalize()} {raw['display_name']}",
+        "scientific_name": raw["scientific_name"], "category": raw["category"],
+        "lookalike_group": raw["lookalike_group"], "toxicity_level": raw["toxicity_level"],
+        "requires_cooking": False, "edible_raw": True, "hunger": raw["hunger"] + 1,
+        "morale": raw["morale"] + 1, "energy": raw["energy"] + 1,
+        "description": f"{method.capitalize()} version of {raw['display_name'].lower()}",
+        "region": raw["region"], "identified": True,
+    })
+
+def derived_cooked(catalog, name, method):
+    item = catalog.cooked(name, method)
+    item["hunger"], item["display_name"]  # what eat() and the menus read
+
+def run_cooked(path):
+    """Cook every item every way, into a freshly loaded catalog per approach."""
+    for label, cook in (("stored in the catalog", stored_cooked), ("derived, bounded cache", derived_cooked)):
+        catalog = content.load_items(path)
+        names = list(catalog)
+
+        def cook_all():
+            for method in COOKING_METHODS:
+                for name in names:
+                    cook(catalog, name, method)
+        _, grown = traced(cook_all)
+        if cook is stored_cooked:
+            print(f"\n== cooked variants: {len(names):,} items x {len(COOKING_METHODS)} methods ==")
+        print(f"  {label:<24} +{grown / 1e6:7.1f} MB   catalog rows {len(names):,} → {len(catalog):,}   "
+              f"cache {len(catalog.cooked_cache):,}/{COOKED_CACHE_SIZE:,}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "items.csv")
+        scaled_csv(path, args.items)
+        dicts, dict_bytes = traced(lambda: load_dicts(path))
+        catalog, catalog_bytes = traced(lambda: content.load_items(path))
+        run_cooked(path)
+
+    print(f"\n== memory, {args.items:,} items ==")
+    print(f"  dict of dicts      {dict_bytes / 1e6:8.1f} MB")
+    print(f"  columnar catalog   {catalog_bytes / 1e6:8.1f} MB   ({catalog_bytes / dict_bytes:.0%})")
+
+    groups = catalog.values_of("lookalike_group")
+    QUERIES["lookalike group"] = dict(lookalike_group=max(groups, key=lambda g: len(catalog.rows_where(lookalike_group=g))))
+    for label, query in QUERIES.items():
+        expected = scan(dicts, **query)
+        assert catalog.where(**query) == expected, label
+        report(f"query: {label} ({len(expected):,} of {args.items:,})", [
+            ("scan dicts", measure(lambda: scan(dicts, **query), number=5, repeat=3)),
+            ("catalog index", measure(lambda: catalog.where(**query), number=5, repeat=3)),
+        ])
+
+    name = next(iter(dicts))
+    report("one field by name", [
+        ("dict", measure(lambda: dicts[name]["hunger"], number=200000)),
+        ("catalog view", measure(lambda: catalog[name]["hunger"], number=200000)),
+        ("catalog.value", measure(lambda: catalog.value(name, "hunger"), number=200000)),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from benchmarks.harness import measure, report
+
+import os
+import content
+
+def main():
+    bundle_path = os.path.join(content.DATA_DIR, content.BUNDLE_NAME)
+    content.build_bundle()
+    report("content load (all tables)", [
+        ("parse + convert CSVs", measure(content.compile_content, number=50)),
+        ("compiled bundle (fresh)", measure(content.load_content, number=50)),
+    ])
+    print(f"  bundle: {os.path.getsize(bundle_path):,} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from benchmarks.harness import measure, report
+
+import random
+import RPGTEST8 as game
+from catalog import ItemCatalog
+
+def legacy_forage_scan(items, biome_name, perception_bonus):
+    """The old full-catalog scan: one randint per item in the biome."""
+    found_items = []
+    for item in items.values():
+        if item["region"] != biome_name:
+            continue
+        base_chance = max(1, 6 - int(item["rarity"]))
+        roll = random.randint(1, 10)
+        if roll <= base_chance + perception_bonus:
+            found_items.append(item)
+    return found_items
+
+def indexed_forage_roll(index, biome_name, perception_bonus):
+    candidates, thresholds = index.get(biome_name, ((), ()))
+    rolls = random.choices(game.FORAGE_ROLL, k=len(candidates))
+    return [item for item, threshold, roll in zip(candidates, thresholds, rolls)
+            if roll <= threshold + perception_bonus]
+
+def synthetic_catalog(copies):
+    """The real catalog repeated `copies` times, with varied rarity.
+
+    Returns (dict of dicts for the legacy scan, ItemCatalog for the index).
+    """
+    items = {}
+    for i in range(copies):
+        for name, item in game.ITEM_DATA.items():
+            clone = dict(item, name=f"{name}_{i}", rarity=1 + (i + len(name)) % 5)
+            items[clone["name"]] = clone
+    return items, ItemCatalog(items.values())
+
+def main():
+    biome = game.biome_table[0]["biome_name"]
+    for copies in (1, 100, 1000):
+        items, catalog = synthetic_catalog(copies)
+        index = game.build_forage_index(catalog)
+        number = max(10, 20000 // copies)
+        report(f"forage roll, {len(catalog):,} items in catalog", [
+            ("legacy full scan", measure(lambda: legacy_forage_scan(items, biome, 1), number=number)),
+            ("biome index + batched rolls", measure(lambda: indexed_forage_roll(index, biome, 1), number=number)),
+        ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Frames per second of split_screen: the old clear-and-print version vs the diffing renderer.
+
+Frames come from a real travel sequence (history grows, status changes).
+All output goes to /dev/null, including the `clear` child process, so
+only the cost of producing the frame is timed.
+
+    python -m benchmarks.bench_render [--frames 200]
+"""
+# Imported for its side effect: chdir to RPG/ and put it on sys.path
+import benchmarks.harness  # noqa: F401
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import textwrap
+import time
+
+import RPGTEST8 as game
+import render
+from render import FrameRenderer
+
+def legacy_split_screen(permanent_history, menu_lines, max_menu=25, max_narrative=10, wrap_width=35):
+    """split_screen as it was: fork `clear`, re-wrap everything, print row by row."""
+    os.system('cls' if os.name == 'nt' else 'clear')  # Clear terminal screen
+    left_width = 45
+    right_width = 45
+
+    wrapped_narrative = []
+    for line in permanent_history[-max_narrative:]:
+        wrapped_narrative.extend(textwrap.wrap(line, width=wrap_width) or [""])
+
+    wrapped_menu = []
+    for line in menu_lines:
+        wrapped_menu.extend(textwrap.wrap(line, width=wrap_width) or [""])
+
+    max_lines = max(len(wrapped_narrative), len(wrapped_menu))
+    for i in range(max_lines):
+        left = wrapped_narrative[i] if i < len(wrapped_narrative) else ""
+        right = wrapped_menu[i] if i < len(wrapped_menu) else ""
+        print(left.ljust(left_width) + right.ljust(right_width))
+
+def status_menu(state):
+    return [
+        "=== STATUS ===",
+        f"Biome   : {state.current_biome['biome_name']}",
+        f"Time    : {str(state.current_hour).zfill(2)}:00",
+        f"Hunger  : {state.hunger}/100",
+        f"Energy  : {state.energy}/100",
+        f"Morale  : {state.morale}/100",
+        f"Progress: {state.hours_walked}/{state.required_hours or '?'} hrs",
+        "[1] Eat",
+        "[2] Travel",
+        "[3] Camp",
+    ]
+
+def travel_frames(count, seed=3):
+    """(history, menu) for `count` consecutive travel turns."""
+    frames = []
+    state = game.new_game(seed)
+    while len(frames) < count:
+        if state.status():
+            state = game.new_game(seed + len(frames))
+        game.travel(state)
+        frames.append((list(state.narrative_history), status_menu(state)))
+    return frames
+
+@contextlib.contextmanager
+def devnull_stdout():
+    """Send both Python's and the OS's stdout to /dev/null."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    null = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(null, 1)
+    try:
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            yield sink
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(null)
+
+def fps(draw, frames, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for history, menu in frames:
+            draw(history, menu)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    travel = travel_frames(args.frames)
+    # Menu navigation: the narrative stays put while the menu changes
+    history = travel[-1][0]
+    menus = [["[1] Eat Item", "[5] Back"], ["[1] Wait", "[2] Sleep", "[5] Back"], travel[-1][1]]
+    browsing = [(history, menus[i % len(menus)]) for i in range(args.frames)]
+
+    for title, frames in (("travel turns", travel), ("menu browsing", browsing)):
+        run_scenario(title, frames)
+    run_session_length(travel)
+
+def run_session_length(travel, turns=200):
+    """Per-frame cost as the session's history grows; one new line per frame."""
+    lines = [line for history, _ in travel for line in history[-2:]]
+    menu = travel[-1][1]
+    print("\n== frame cost vs session length (one new line per frame) ==")
+    for length in (10, 1000, 100000):
+        timings = {}
+        for label, cached in (("uncached wrap", False), ("wrap cache", True)):
+            history = [lines[i % len(lines)] for i in range(length)]
+            renderer = FrameRenderer(io.StringIO(), size=(90, 30))
+            render.wrap_line.cache_clear()
+            start = time.perf_counter()
+            for i in range(turns):
+                history.append(f"{lines[i % len(lines)]} ({i})")
+                if not cached:
+                    render.wrap_line.cache_clear()
+                    render.wrap_block.cache_clear()
+                renderer.render(history, menu)
+            timings[label] = (time.perf_counter() - start) / turns
+        print(f"  {length:>7,} lines   uncached {timings['uncached wrap'] * 1e6:8.1f} µs/frame   "
+              f"cached {timings['wrap cache'] * 1e6:8.1f} µs/frame   x{timings['uncached wrap'] / timings['wrap cache']:5.1f}")
+
+def run_scenario(title, frames):
+    results = {}
+    with devnull_stdout() as sink:
+        results["legacy clear + print"] = fps(legacy_split_screen, frames[:max(10, len(frames) // 10)])
+
+        full = FrameRenderer(sink, size=(90, 30))
+
+        def draw_full(history, menu):
+            full.invalidate()
+            full.draw(history, menu)
+        results["renderer, full redraw"] = fps(draw_full, frames)
+
+        diffed = FrameRenderer(sink, size=(90, 30))
+        results["renderer, changed rows only"] = fps(diffed.draw, frames)
+
+    # Bytes on the wire per frame (what an SSH or socket client receives)
+    printed = io.StringIO()
+    with devnull_stdout(), contextlib.redirect_stdout(printed):
+        for history, menu in frames:
+            legacy_split_screen(history, menu)
+    legacy_bytes = len(printed.getvalue().encode())  # plus the clear sequence itself
+
+    renderer = FrameRenderer(io.StringIO(), size=(90, 30))
+    diff_bytes = sum(len(renderer.render(history, menu).encode()) for history, menu in frames)
+    full_bytes = 0
+    for history, menu in frames:
+        renderer.invalidate()
+        full_bytes += len(renderer.render(history, menu).encode())
+
+    n = len(frames)
+    print(f"\n== split_screen, {n} frames of {title} ==")
+    baseline = results["legacy clear + print"]
+    for label, rate in results.items():
+        print(f"  {label:<32} {rate:10.0f} frames/s   x{rate / baseline:7.1f}")
+    print(f"  bytes/frame: legacy {legacy_bytes / n:.0f}, full redraw {full_bytes / n:.0f}, "
+          f"changed rows {diff_bytes / n:.0f}")
+
+if __name__ == "__main__":
+    main()
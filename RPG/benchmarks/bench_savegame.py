@@ -0,0 +1,130 @@
+"""Save file round trips, size and speed.
+
+First checks that loading rebuilds the exact state: after every action of
+many seeded games, after a torn final write, and by playing on from a
+loaded state in lockstep with the live one. Then times delta saves,
+snapshots and loads, next to pickling the same state.
+
+    python -m benchmarks.bench_savegame [--games 30]
+"""
+from benchmarks.harness import measure
+
+import argparse
+import copy
+import os
+import pickle
+import random
+import tempfile
+import time
+
+import RPGTEST8 as game
+import simulate
+from savegame import SaveError, SaveFile, capture, load_game
+
+def fingerprint(state):
+    snap = capture(state)
+    snap["history"] = list(state.narrative_history)
+    snap["biome"] = state.current_biome["biome_name"]
+    return snap
+
+def play(state, rng, actions):
+    for _ in range(actions):
+        if state.status():
+            return
+        action, args = simulate.survivor(simulate.observe(state), rng)
+        simulate.act(state, action, *args)
+        yield
+
+def check_round_trips(path, games):
+    biomes = game.biome_table
+    for seed in range(games):
+        state = game.new_game(seed)
+        save = SaveFile(path, state, snapshot_every=25)
+        rng = random.Random(seed)
+        previous = fingerprint(state)
+        for turn, _ in enumerate(play(state, rng, 400)):
+            save.save(state)
+            expected = fingerprint(state)
+            if turn % 7 == 0:
+                assert fingerprint(load_game(path, biomes)) == expected, (seed, turn)
+            if turn % 7 == 0 and save.since_snapshot:
+                # A crash halfway through the last delta loses only that save
+                # (snapshots are written to a temp file and renamed into place)
+                with open(path, "rb") as f:
+                    data = f.read()
+                torn = path + ".torn"
+                with open(torn, "wb") as f:
+                    f.write(data[:-3])
+                assert fingerprint(load_game(torn, biomes)) == previous, (seed, turn, "torn")
+            previous = expected
+        save.close()
+
+        # Play on from the loaded state in lockstep with the live one
+        live = state
+        loaded = load_game(path, biomes)
+        rng_live, rng_loaded = random.Random(seed + 1), random.Random(seed + 1)
+        for _ in zip(play(live, rng_live, 50), play(loaded, rng_loaded, 50)):
+            assert fingerprint(loaded) == fingerprint(live), (seed, "play on")
+
+    with open(path, "r+b") as f:
+        f.seek(4)
+        f.write(b"\xff\xff")
+    try:
+        load_game(path, biomes)
+    except SaveError:
+        pass
+    else:
+        raise AssertionError("unknown save version loaded")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "save.trpg")
+        check_round_trips(path, args.games)
+        print(f"round trips ok over {args.games} games")
+
+        # A mid-game state to time against
+        state = game.new_game(7)
+        for _ in play(state, random.Random(7), 150):
+            pass
+        save = SaveFile(path, state, snapshot_every=10 ** 9)
+        snapshot_size = os.path.getsize(path)
+
+        # A delta after one more action
+        turn_state = copy.deepcopy(state)
+        rng = random.Random(8)
+        deltas, save_times = [], []
+        for _ in play(turn_state, rng, 200):
+            before = os.path.getsize(path)
+            start = time.perf_counter()
+            save.save(turn_state)
+            save_times.append(time.perf_counter() - start)
+            deltas.append(os.path.getsize(path) - before)
+        save.close()
+        save_times.sort()
+
+        save = SaveFile(path, state, snapshot_every=10 ** 9)
+        t_delta = measure(lambda: save.save(state), number=2000)
+        t_snapshot = measure(lambda: save.snapshot(state), number=200)
+        save.close()
+        t_load = measure(lambda: load_game(path, game.biome_table), number=200)
+
+        plain = fingerprint(state)
+        plain["rng"] = state.rng.getstate()
+        t_pickle = measure(lambda: pickle.dumps(plain, protocol=pickle.HIGHEST_PROTOCOL), number=2000)
+        pickle_size = len(pickle.dumps(plain, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print("\n== save file ==")
+    print(f"  snapshot          {snapshot_size:7,} bytes   {t_snapshot * 1e6:8.1f} µs (write + rename)")
+    print(f"  delta per action  {sum(deltas) / len(deltas):7,.0f} bytes avg, {max(deltas):,} max   "
+          f"{save_times[len(save_times) // 2] * 1e6:8.1f} µs median, "
+          f"{save_times[int(len(save_times) * 0.99)] * 1e6:.1f} µs p99")
+    print(f"  save, no change   {0:7,} bytes   {t_delta * 1e6:8.1f} µs")
+    print(f"  load snapshot     {'':>7}         {t_load * 1e6:8.1f} µs")
+    print(f"  pickle of state   {pickle_size:7,} bytes   {t_pickle * 1e6:8.1f} µs (dumps only, no I/O)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Per-session memory footprint of GameState.
+
+Allocates many sessions under tracemalloc and reports bytes per session,
+fresh and after some play, next to the same state held in a plain
+__dict__ object. Write --json to track the numbers across changes.
+
+    python -m benchmarks.bench_session_memory [--sessions 2000] [--actions 100] [--json memory.json]
+"""
+# Imported for its side effect: chdir to RPG/ and put it on sys.path
+import benchmarks.harness  # noqa: F401
+
+import argparse
+import json
+import random
+import tracemalloc
+
+import RPGTEST8 as game
+import simulate
+from game_state import GameState
+
+class DictGameState:
+    """Same fields as GameState, kept in an instance __dict__ (the no-slots baseline)."""
+
+    def __init__(self, biome_table, seed=None):
+        source = GameState(biome_table, seed)
+        for name in GameState.__slots__:
+            setattr(self, name, getattr(source, name))
+
+def bytes_per_session(make, sessions):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    states = [make(seed) for seed in range(sessions)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del states
+    return (after - before) / sessions
+
+def played(seed, actions):
+    """A session after `actions` survivor-policy actions."""
+    state = game.new_game(seed)
+    rng = random.Random(seed)
+    for _ in range(actions):
+        if state.status():
+            break
+        action, args = simulate.survivor(simulate.observe(state), rng)
+        simulate.act(state, action, *args)
+    return state
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--actions", type=int, default=100, help="actions played per session")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    biomes = game.biome_table
+    results = {
+        "fresh (dict baseline)": bytes_per_session(lambda seed: DictGameState(biomes, seed), args.sessions),
+        "fresh GameState": bytes_per_session(lambda seed: GameState(biomes, seed), args.sessions),
+        f"GameState after {args.actions} actions": bytes_per_session(
+            lambda seed: played(seed, args.actions), args.sessions),
+    }
+
+    print(f"\n== session footprint ({args.sessions} sessions) ==")
+    for label, size in results.items():
+        print(f"  {label:<32} {size / 1024:8.2f} KB/session")
+    print(f"  1000 fresh sessions              {results['fresh GameState'] * 1000 / 1e6:8.2f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"sessions": args.sessions, "bytes_per_session": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Process start cost of the game module, measured with `python -X importtime`.
+
+Each scenario runs in a fresh interpreter, several times, and reports the
+best import time plus peak RSS. The "with pandas" scenario imports pandas
+first, which is what every session process paid before the runtime moved
+to the stdlib table loader.
+
+    python -m benchmarks.bench_startup [--runs 5] [--json startup.json]
+"""
+from benchmarks.harness import RPG_DIR
+
+import argparse
+import json
+import subprocess
+import sys
+
+SCENARIOS = {
+    "game (stdlib tables)": ["RPGTEST8"],
+    "game with pandas": ["pandas", "RPGTEST8"],
+}
+
+# __import__ (not importlib.import_module) so -X importtime sees the import
+PROBE = (
+    "import resource, sys\n"
+    "for name in sys.argv[1:]:\n"
+    "    __import__(name)\n"
+    "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+def parse_importtime(stderr, modules):
+    """Sum the cumulative µs of the given top-level imports."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self_us, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue  # nested import
+        if name.strip() in modules and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total
+
+def run_scenario(modules):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, *modules],
+        cwd=RPG_DIR, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr, modules), int(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for label, modules in SCENARIOS.items():
+        try:
+            runs = [run_scenario(modules) for _ in range(args.runs)]
+        except subprocess.CalledProcessError:
+            print(f"  skipping '{label}': import failed")
+            continue
+        results[label] = {
+            "import_ms": min(us for us, _ in runs) / 1000,
+            "max_rss_kb": min(rss for _, rss in runs),
+        }
+
+    print("\n== startup (best of %d) ==" % args.runs)
+    for label, r in results.items():
+        print(f"  {label:<24} {r['import_ms']:8.1f} ms import   {r['max_rss_kb'] / 1024:7.1f} MB peak RSS")
+    if len(results) == 2:
+        fast, slow = results["game (stdlib tables)"], results["game with pandas"]
+        print(f"  saved: {slow['import_ms'] - fast['import_ms']:.1f} ms, "
+              f"{(slow['max_rss_kb'] - fast['max_rss_kb']) / 1024:.1f} MB per session process")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
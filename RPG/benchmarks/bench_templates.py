@@ -0,0 +1,158 @@
+from benchmarks.harness import measure, report
+
+import csv
+import random
+from narrative import PhraseBuilder, TemplateSelector, compile_templates
+
+try:
+    import pandas as pd
+except ImportError:  # legacy selector comparison is skipped
+    pd = None
+
+# === Legacy implementation (string-splicing loop) ===
+class LegacyPhraseBuilder:
+    def __init__(self, game_state):
+        self.s = game_state
+
+    def get(self, key):
+        h = self.s['hunger']
+        m = self.s['morale']
+        e = self.s['energy']
+        w = self.s['weather']
+        fire = self.s['has_fire']
+        biome = self.s['biome']
+
+        return {
+            "hunger_level": "you’re starving" if h < 30 else "you’re a bit hungry" if h < 60 else "you feel fine",
+            "morale_reaction": "You feel bleak." if m < 30 else "You doubt yourself." if m < 60 else "You’re steady.",
+            "energy_feeling": "You move slowly." if e < 40 else "You’re still alert.",
+            "weather_feeling": {
+                "rain": "Rain clings to your gear.",
+                "fog": "The fog dulls everything.",
+                "storm": "Thunder rolls overhead.",
+                "cold": "Your breath fogs the air.",
+                "clear": "The sky is still.",
+                "wind": "Wind pushes against you."
+            }.get(w, "The weather presses in."),
+            "fire_status": "The fire burns low." if fire else "No fire. Just cold.",
+            "dream_hint": "Dreams flicker and vanish." if m < 40 else "Sleep holds nothing.",
+            "biome": biome["biome_name"] if isinstance(biome, dict) or "biome_name" in biome else str(biome)
+        }.get(key, f"<undefined:{key}>")
+
+def legacy_fill_template(template_string, game_state):
+    pb = LegacyPhraseBuilder(game_state)
+    while "{" in template_string:
+        start = template_string.find("{")
+        end = template_string.find("}", start)
+        key = template_string[start+1:end]
+        phrase = pb.get(key)
+        template_string = template_string[:start] + phrase + template_string[end+1:]
+    return template_string
+
+def legacy_narrative_from_template(template_df, recent_templates, context, game_state, max_recent=3, require_stat=False):
+    matches = template_df[template_df['context'] == context]
+
+    if 'type' in matches.columns:
+        if require_stat:
+            matches = matches[matches['type'] == 'stat']
+        else:
+            matches = matches[matches['type'].isin(['universal', 'stat'])]
+
+    if matches.empty:
+        return "You continue in silence."
+
+    recent = recent_templates.get(context, [])
+    available = matches[~matches['template'].isin(recent)]
+    if available.empty:
+        available = matches
+
+    row = available.sample(1).iloc[0]
+    template = row['template']
+
+    recent.append(template)
+    if len(recent) > max_recent:
+        recent.pop(0)
+    recent_templates[context] = recent
+
+    return legacy_fill_template(template, game_state)
+
+# === Benchmark ===
+def main():
+    with open("data/narrative_templates.csv", newline="", encoding="utf-8") as f:
+        templates = [row["template"] for row in csv.DictReader(f)]
+    compiled = compile_templates(templates)
+
+    states = [
+        {"biome": "Cool Damp Coast", "weather": w, "hunger": h, "morale": m, "energy": e, "has_fire": fire}
+        for w in ["clear", "rain", "fog", "storm", "cold", "wind"]
+        for h, m, e, fire in [(80, 70, 80, False), (45, 35, 30, True), (10, 20, 90, False)]
+    ]
+
+    # Both paths must produce identical text before we time them
+    for t in templates:
+        for s in states:
+            assert compiled[t].fill(s) == legacy_fill_template(t, s), t
+
+    def run_legacy():
+        for t in templates:
+            legacy_fill_template(t, states[0])
+
+    def run_compiled():
+        for t in templates:
+            compiled[t].fill(states[0])
+
+    n = len(templates)
+    report(f"fill_template ({n} templates per call)", [
+        ("legacy string-splicing loop", measure(run_legacy, number=2000)),
+        ("precompiled segments", measure(run_compiled, number=2000)),
+    ])
+
+    keys = ["hunger_level", "morale_reaction", "energy_feeling", "weather_feeling",
+            "fire_status", "dream_hint", "biome"]
+    for s in states:
+        for key in keys:
+            assert PhraseBuilder(s).get(key) == LegacyPhraseBuilder(s).get(key), key
+
+    def get_legacy():
+        for key in keys:
+            LegacyPhraseBuilder(states[1]).get(key)
+
+    def get_lazy():
+        for key in keys:
+            PhraseBuilder(states[1]).get(key)
+
+    report(f"PhraseBuilder.get ({len(keys)} keys per call)", [
+        ("legacy full-dict build", measure(get_legacy, number=5000)),
+        ("lazy bucketed cache", measure(get_lazy, number=5000)),
+    ])
+
+    with open("data/narrative_templates.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    selector = TemplateSelector(rows)
+    recent = {}
+
+    # Never repeat one of the last 3 templates while alternatives remain
+    rng = random.Random(1)
+    last = []
+    for _ in range(500):
+        t = selector.pick("travel", recent, rng=rng).source
+        assert t not in last, t
+        last = (last + [t])[-3:]
+    assert selector.pick("nowhere", recent) is None
+
+    def select_indexed():
+        template = selector.pick("travel", recent)
+        return template.fill(states[0])
+
+    rows_out = []
+    if pd is not None:
+        template_df = pd.DataFrame(rows)
+        legacy_recent = {}
+        rows_out.append(("legacy pandas filter + sample", measure(
+            lambda: legacy_narrative_from_template(template_df, legacy_recent, "travel", states[0]),
+            number=500)))
+    rows_out.append(("indexed selector", measure(select_indexed, number=20000)))
+    report("narrative_from_template", rows_out)
+
+if __name__ == "__main__":
+    main()
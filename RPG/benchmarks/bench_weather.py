@@ -0,0 +1,86 @@
+"""Weather draws: random.choices over the weight columns vs the biome's alias table.
+
+Also checks that bulk draws match the same number of single draws, that
+both the independent and the persistence (Markov) draws reproduce the
+biome's weather frequencies, and that persistence lengthens runs of the
+same weather as expected: mean run length 1 / (1 - P(stay)).
+
+    python -m benchmarks.bench_weather [--draws 200000] [--persistence 0.6]
+"""
+from benchmarks.harness import measure, report
+
+import argparse
+import random
+
+import RPGTEST8 as game
+from content import WEATHER_COLS
+from weather import AliasTable, draw_chain
+
+def frequencies(draws):
+    return [draws.count(i) / len(draws) for i in range(len(WEATHER_COLS))]
+
+def mean_run(draws):
+    runs = 1 + sum(1 for a, b in zip(draws, draws[1:]) if a != b)
+    return len(draws) / runs
+
+def check_bulk_matches_single(table, persistence):
+    for seed in range(50):
+        for k in (1, 2, 24, 500):
+            bulk, single = random.Random(seed), random.Random(seed)
+            assert table.draw_many(bulk, k) == [table.draw(single) for _ in range(k)], (seed, k)
+            bulk, single = random.Random(seed), random.Random(seed)
+            hours, previous = [], None
+            for _ in range(k):
+                previous = draw_chain(table, persistence, previous, single, 1)[0]
+                hours.append(previous)
+            assert draw_chain(table, persistence, None, bulk, k) == hours, (seed, k, "chain")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--draws", type=int, default=200000)
+    parser.add_argument("--persistence", type=float, default=0.6)
+    args = parser.parse_args()
+
+    biome = game.biome_table[1]
+    weights = [biome[col] for col in WEATHER_COLS]
+    table = AliasTable(weights)  # draws are indexes here, to count them
+    named = AliasTable(weights, WEATHER_COLS)
+    p = args.persistence
+    check_bulk_matches_single(named, p)
+    rng = random.Random(5)
+
+    independent = table.draw_many(rng, args.draws)
+    persistent = draw_chain(table, p, None, rng, args.draws)
+    stay = sum(w * (args.persistence + (1 - args.persistence) * w) for w in weights)
+    print(f"\n== {biome['biome_name']}: frequencies over {args.draws:,} hours ==")
+    print(f"  {'weather':<8}{'weight':>9}{'alias':>9}{'markov':>9}")
+    for i, col in enumerate(WEATHER_COLS):
+        print(f"  {col:<8}{weights[i]:9.3f}{frequencies(independent)[i]:9.3f}{frequencies(persistent)[i]:9.3f}")
+    for got, want in zip(frequencies(independent) + frequencies(persistent), weights + weights):
+        assert abs(got - want) < 0.02, (got, want)
+    print(f"  mean run: independent {mean_run(independent):.2f} (expect {1 / (1 - sum(w * w for w in weights)):.2f}), "
+          f"persistence {args.persistence}: {mean_run(persistent):.2f} (expect {1 / (1 - stay):.2f})")
+
+    def choices(k):
+        return rng.choices(WEATHER_COLS, weights=[biome[col] for col in WEATHER_COLS], k=k)
+
+    def alias(k):
+        return named.draw_many(rng, k)
+
+    def markov(k):
+        return draw_chain(named, p, "clear", rng, k)
+
+    for hours in (1, 24):
+        report(f"draw {hours} hour(s) of weather", [
+            ("random.choices (before)", measure(lambda: choices(hours), number=20000)),
+            ("alias table", measure(lambda: alias(hours), number=20000)),
+            ("alias, markov chain", measure(lambda: markov(hours), number=20000)),
+        ])
+    state = game.new_game(3)
+    report("game.draw_weather", [
+        ("1 hour", measure(lambda: game.draw_weather(state, 1), number=20000)),
+        ("24 hours", measure(lambda: game.draw_weather(state, 24), number=20000)),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+import timeit
+
+# Game modules load their data with paths relative to RPG/
+RPG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(RPG_DIR)
+if RPG_DIR not in sys.path:
+    sys.path.insert(0, RPG_DIR)
+
+def measure(fn, number=10000, repeat=5):
+    """Best-of-`repeat` seconds per call of fn()."""
+    timer = timeit.Timer(fn)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def report(title, rows):
+    """Print (label, seconds_per_call) rows; speedup is relative to the first row."""
+    print(f"\n== {title} ==")
+    baseline = rows[0][1]
+    for label, seconds in rows:
+        print(f"  {label:<32} {seconds * 1e6:10.2f} µs/call   x{baseline / seconds:6.2f}")
@@ -0,0 +1,340 @@
+"""The benchmark suite: hot paths and whole sessions, checked against a baseline.
+
+Every case uses fixed seeds, so runs differ only by machine noise. The
+cases are timed round-robin, after a warmup round, so a slow spell on the
+machine lands on every case alike. Each case keeps the median of its rounds
+and its spread: the median absolute deviation, relative to the median.
+Results are compared with benchmarks/baseline.json. A case counts as a
+regression when it is slower than its baseline by more than the threshold,
+or by more than NOISE_FACTOR times the two runs' spreads if that is wider.
+Regressions make the exit status 1.
+
+    python -m benchmarks.run                     # compare with the baseline
+    python -m benchmarks.run --save              # record a new baseline
+    python -m benchmarks.run -k forage -k split  # only matching cases
+    python -m benchmarks.run --threshold 0.1 --json results.json
+
+Baselines are per machine: re-record one (--save) before comparing on a
+different host or Python.
+"""
+from benchmarks.harness import RPG_DIR
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+from statistics import median
+
+import RPGTEST8 as game
+import content
+import simulate
+from ambient_scene import describe_ambient_scene, describe_ambient_scenes
+from render import NullScreen, Screen
+
+BASELINE_PATH = os.path.join(RPG_DIR, "benchmarks", "baseline.json")
+THRESHOLD = 0.20   # fraction slower than baseline that counts as a regression
+NOISE_FACTOR = 2   # ...or this many times the runs' combined spread, if wider
+REPEAT = 15        # timed rounds per case
+WARMUP = 1         # untimed rounds first
+SEED = 7
+
+# === Cases ===
+# Each case builds its inputs once and returns (fn, calls per timing).
+CASES = {}
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+def playing_state(seed=SEED, turns=20):
+    """A run some way in, so history, templates and weather are warmed up."""
+    state = game.new_game(seed)
+    for _ in range(turns):
+        game.travel(state)
+    return state
+
+@case("load_items")
+def bench_load_items():
+    return lambda: content.load_items(), 50
+
+@case("load_biomes")
+def bench_load_biomes():
+    return lambda: content.load_biomes(), 500
+
+@case("fill_template")
+def bench_fill_template():
+    state = playing_state()
+    context = game.current_state(state, "rain")
+    templates = [row["template"] for row in game.template_table]
+    return lambda: [game.fill_template(t, context) for t in templates], 100
+
+@case("narrative_from_template")
+def bench_narrative():
+    state = playing_state()
+    context = game.current_state(state, "fog")
+    return lambda: game.narrative_from_template(state, "travel", context), 20000
+
+def ambient_states(count=64, seed=SEED):
+    state = playing_state(seed)
+    weathers = game.draw_weather(state, count)
+    return [{"morale": (i * 37) % 101, "energy": (i * 53) % 101, "hunger": (i * 71) % 101,
+             "weather": weathers[i]} for i in range(count)]
+
+@case("describe_ambient_scene x64")
+def bench_ambient_single():
+    states = ambient_states()
+    state = playing_state()
+    return lambda: [describe_ambient_scene(s, state.rng) for s in states], 500
+
+@case("describe_ambient_scenes x64")
+def bench_ambient_batch():
+    states = ambient_states()
+    state = playing_state()
+    return lambda: describe_ambient_scenes(states, state.rng), 500
+
+ACTION_TYPES = ("eat_action", "walk_action", "wait_action", "sleep_action")
+
+@case("choose_words x64")
+def bench_choose_words():
+    state = playing_state()
+    requests = [(ACTION_TYPES[i % 4], (i * 37) % 101) for i in range(64)]
+    return lambda: game.choose_words(requests, rng=state.rng), 5000
+
+@case("forage")
+def bench_forage():
+    state = playing_state()
+    return lambda: game.forage(state), 20000
+
+@case("advance_time 1h")
+def bench_advance_1():
+    state = playing_state()
+    return lambda: game.advance_time(state, 1), 20000
+
+@case("advance_time 24h")
+def bench_advance_24():
+    state = playing_state()
+    return lambda: game.advance_time(state, 24, sleep_bonus=4, sleep_morale_bonus=1), 5000
+
+@case("calculate_required_hours")
+def bench_required_hours():
+    biomes = game.biome_table
+    weathers = content.WEATHER_COLS
+
+    def run():
+        for i, biome in enumerate(biomes):
+            game.calculate_required_hours(biome, weathers[i % len(weathers)], 55, 70)
+    return run, 5000
+
+@case("plant guide page + lookups")
+def bench_plant_guide():
+    state = playing_state()
+    state.out = NullScreen()
+    lines = ["false", "", "king bolete", "", "snow", "zzz", "5"]
+    return lambda: game.run_script(game.plant_guide_menu(state), lines), 2000
+
+def status_menu(state):
+    return [f"Biome   : {state.current_biome['biome_name']}",
+            f"Time    : {state.current_hour:02d}:00",
+            f"Hunger  : {state.hunger}/100",
+            f"Energy  : {state.energy}/100",
+            f"Morale  : {state.morale}/100",
+            "[1] Eat", "[2] Travel", "[3] Camp", "[4] Journal"]
+
+def scrolling_turns(invalidate):
+    """One new narrative line and a changed status row per frame, like a turn.
+
+    The status cycles through a few values, as clock and stats do in play,
+    so wrapping hits its cache and the cases time the drawing itself.
+    """
+    state = playing_state()
+    screen = Screen(io.StringIO(), size=(90, 30))
+    lines = list(state.narrative_history)
+    history = list(lines)
+    menu = status_menu(state)
+    turn = iter(range(10 ** 9))
+
+    def run():
+        i = next(turn)
+        history.append(lines[i % len(lines)])
+        del history[0]
+        if invalidate:
+            screen.renderer.invalidate()
+        screen.renderer.stream.seek(0)
+        game.split_screen(history, [f"Turn {i % 24}"] + menu, out=screen)
+    return run, 5000
+
+@case("split_screen full redraw")
+def bench_split_full():
+    return scrolling_turns(invalidate=True)
+
+@case("split_screen new line")
+def bench_split_diff():
+    return scrolling_turns(invalidate=False)
+
+@case("split_screen menu change")
+def bench_split_menu():
+    state = playing_state()
+    screen = Screen(io.StringIO(), size=(90, 30))
+    history = list(state.narrative_history)
+    menus = [("[1] Eat Item", "[5] Back"), ("[1] Wait", "[2] Sleep", "[5] Back"), tuple(status_menu(state))]
+    turn = iter(range(10 ** 9))
+
+    def run():
+        screen.renderer.stream.seek(0)
+        game.split_screen(history, menus[next(turn) % len(menus)], out=screen)
+    return run, 5000
+
+# --- Whole sessions ---
+SESSION_SCRIPT = (
+    "2", "2", "2",              # travel
+    "3", "1", "1", "3", "5",    # camp, rest, wait 3 hours, back
+    "5",                        # back to the main menu
+    "4", "1", "1", "5",         # journal, two pages back, back
+    "2", "2",
+    "3", "1", "2", "6", "5", "5",  # camp, rest, sleep 6 hours
+    "1", "5",                   # food menu and back
+)
+
+def scripted_session(out, inputs=400, seed=SEED):
+    """Drive main_menu with SESSION_SCRIPT on repeat, starting over when a run ends."""
+    handled = 0
+    while handled < inputs:
+        state = game.new_game(seed + handled)
+        state.out = out
+        menu = game.main_menu(state)
+        next(menu)
+        try:
+            while handled < inputs:
+                menu.send(SESSION_SCRIPT[handled % len(SESSION_SCRIPT)])
+                handled += 1
+        except StopIteration:
+            handled += 1
+
+@case("session 400 inputs, headless")
+def bench_session_headless():
+    screen = NullScreen()
+    return lambda: scripted_session(screen), 5
+
+@case("session 400 inputs, rendered")
+def bench_session_rendered():
+    stream = io.StringIO()
+    screen = Screen(stream, size=(90, 30))
+
+    def run():
+        stream.seek(0)
+        stream.truncate()
+        scripted_session(screen)
+    return run, 5
+
+@case("simulate survivor game")
+def bench_simulated_game():
+    return lambda: simulate.play(SEED, "survivor"), 5
+
+# === Running and comparing ===
+def summarize(times):
+    mid = median(times)
+    return {"median": mid, "min": min(times), "spread": median(abs(t - mid) for t in times) / mid}
+
+def run_cases(names, repeat, warmup):
+    """Time the cases round-robin; name -> {"median", "min", "spread"} seconds per call."""
+    timers = []
+    for name in names:
+        fn, number = CASES[name]()
+        timers.append((name, timeit.Timer(fn), number))
+    samples = {name: [] for name in names}
+    for round_number in range(warmup + repeat):
+        for name, timer, number in timers:
+            seconds = timer.timeit(number) / number
+            if round_number >= warmup:
+                samples[name].append(seconds)
+    results = {}
+    for name, times in samples.items():
+        result = results[name] = summarize(times)
+        print(f"  {name:<34} {result['median'] * 1e6:12.2f} µs/call  ±{result['spread']:5.1%}"
+              f"   (min {result['min'] * 1e6:.2f})", flush=True)
+    return results
+
+def machine():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system()}
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold):
+    """Print each case against its baseline; returns the names that regressed."""
+    regressed = []
+    print(f"\n== against baseline (threshold +{threshold:.0%}, or {NOISE_FACTOR}x the spread if wider) ==")
+    for name, result in results.items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            print(f"  {name:<34} {'new':>12}")
+            continue
+        if not isinstance(before, dict):
+            before = {"median": before, "spread": 0.0}  # baselines saved before spreads were kept
+        change = result["median"] / before["median"] - 1
+        limit = max(threshold, NOISE_FACTOR * (result["spread"] + before["spread"]))
+        flag = ""
+        if change > limit:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"  {name:<34} {before['median'] * 1e6:12.2f} → {result['median'] * 1e6:10.2f} µs"
+              f"   {change:+7.1%}  (limit +{limit:.0%}){flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="only cases whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help=f"timed rounds per case; the median is kept (default {REPEAT})")
+    parser.add_argument("--warmup", type=int, default=WARMUP,
+                        help=f"untimed rounds before them (default {WARMUP})")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"slowdown that counts as a regression (default {THRESHOLD})")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--json", help="also write this run's results here")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.filters or any(f in name for f in args.filters)]
+    if not names:
+        sys.exit("No benchmark matches " + ", ".join(args.filters))
+    print(f"== {len(names)} benchmarks, median of {args.repeat} rounds after {args.warmup} warmup ==")
+    results = run_cases(names, args.repeat, args.warmup)
+    record = {"machine": machine(), "cases": results}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1)
+    if args.save:
+        baseline = load_baseline(args.baseline)
+        if baseline and args.filters:
+            baseline["cases"].update(results)  # a partial run refreshes only its cases
+            record["cases"] = baseline["cases"]
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1, sort_keys=True)
+        print(f"\nBaseline saved to {os.path.relpath(args.baseline)}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {os.path.relpath(args.baseline)}; record one with --save")
+        return
+    if baseline.get("machine") != record["machine"]:
+        print(f"\nNote: baseline was recorded on {baseline.get('machine')}")
+    regressed = compare(results, baseline, args.threshold)
+    if regressed:
+        print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
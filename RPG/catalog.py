@@ -0,0 +1,293 @@
+import sys
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import chain
+from operator import itemgetter
+
+# === Item Catalog ===
+# Items are stored column by column instead of one dict per item: numbers
+# in typed arrays, flags in a bytearray, low-cardinality strings (category,
+# region, lookalike group) as small integer codes, and free text as
+# interned strings, so repeated descriptions are stored once.
+#
+# Indexed fields keep, for each distinct value, the sorted row numbers that
+# hold it. A query looks up those row lists and intersects them, so its
+# cost follows the size of the matching lists, not of the catalog.
+#
+# The catalog is still a Mapping of name -> item, where an item is a
+# read-only view of one row, so `ITEM_DATA[name]["hunger"]` keeps working.
+
+NUMERIC_FIELDS = ("toxicity_level", "hunger", "morale", "energy", "rarity", "min_perception_to_identify")
+FLAG_FIELDS = ("identified", "plant_guide_feature", "requires_cooking", "edible_raw")
+CATEGORY_FIELDS = ("category", "lookalike_group", "region")
+TEXT_FIELDS = ("name", "display_name", "scientific_name", "description",
+               "desc_vague", "desc_low", "desc_med", "desc_high")
+FIELDS = TEXT_FIELDS[:3] + CATEGORY_FIELDS + NUMERIC_FIELDS + FLAG_FIELDS + TEXT_FIELDS[3:]
+INDEXED_FIELDS = CATEGORY_FIELDS + ("toxicity_level",)
+
+# Cooked variants ("boiled_king_bolete") are never stored: looking one up
+# builds a CookedItem over the raw item's row, kept in a small LRU cache.
+COOKING_METHODS = ("boiled", "roasted", "fried", "steamed")
+COOKED_BONUS = 1          # added to hunger, morale and energy by cooking
+COOKED_CACHE_SIZE = 1024  # variants kept built; evicted ones are simply rebuilt
+
+NUMBER_TYPE = "h"  # signed 16-bit: stat deltas, levels and rarity are small
+NUMBER_MIN, NUMBER_MAX = -2 ** 15, 2 ** 15 - 1
+
+class Flags:
+    """A bool column, one byte per row."""
+    __slots__ = ("data",)
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def append(self, value):
+        self.data.append(1 if value else 0)
+
+    def __getitem__(self, row):
+        return self.data[row] == 1
+
+    def __len__(self):
+        return len(self.data)
+
+class Categorical:
+    """A string column with few distinct values: one code per row."""
+    __slots__ = ("codes", "values", "lookup")
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values = []   # code -> value
+        self.lookup = {}   # value -> code
+
+    def code(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code(sys.intern(value)))
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def __len__(self):
+        return len(self.codes)
+
+class ItemView(Mapping):
+    """One catalog row, read like the dict it replaces."""
+    __slots__ = ("catalog", "row")
+
+    def __init__(self, catalog, row):
+        self.catalog = catalog
+        self.row = row
+
+    def __getitem__(self, field):
+        return self.catalog.columns[field][self.row]
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"<item {self['name']!r}>"
+
+class CookedItem(Mapping):
+    """A raw item with a cooking method applied, computed on read."""
+    __slots__ = ("base", "method", "name")
+
+    def __init__(self, base, method, name):
+        self.base = base
+        self.method = method
+        self.name = name
+
+    def __getitem__(self, field):
+        derive = COOKED_FIELDS.get(field)
+        if derive is not None:
+            return derive(self)
+        return self.base[field]
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"<cooked item {self.name!r}>"
+
+def cooked_description(item):
+    return f"{item.method.capitalize()} version of {item.base['display_name'].lower()}"
+
+COOKED_FIELDS = {
+    "name": lambda item: item.name,
+    "display_name": lambda item: f"{item.method.capitalize()} {item.base['display_name']}",
+    "requires_cooking": lambda item: False,
+    "edible_raw": lambda item: True,
+    "identified": lambda item: True,
+    "plant_guide_feature": lambda item: False,
+    "min_perception_to_identify": lambda item: 0,
+    "hunger": lambda item: item.base["hunger"] + COOKED_BONUS,
+    "morale": lambda item: item.base["morale"] + COOKED_BONUS,
+    "energy": lambda item: item.base["energy"] + COOKED_BONUS,
+    "description": cooked_description,
+    "desc_vague": cooked_description,
+    "desc_low": cooked_description,
+    "desc_med": cooked_description,
+    "desc_high": cooked_description,
+}
+
+class ItemCatalog(Mapping):
+    """All items as typed columns, with indexed queries.
+
+    A Mapping of name -> ItemView; cooked names also resolve, to a
+    CookedItem, though only stored items are iterated.
+    """
+
+    def __init__(self, rows=()):
+        self.columns = {}
+        for field in NUMERIC_FIELDS:
+            self.columns[field] = array(NUMBER_TYPE)
+        for field in FLAG_FIELDS:
+            self.columns[field] = Flags()
+        for field in CATEGORY_FIELDS:
+            self.columns[field] = Categorical()
+        for field in TEXT_FIELDS:
+            self.columns[field] = []
+        self.rows = {}  # name -> row number
+        self.indexes = {field: {} for field in INDEXED_FIELDS}  # field -> value -> array of rows
+        self.cooked_cache = OrderedDict()  # cooked name -> CookedItem, least recently used first
+        for row in rows:
+            self.add(row)
+
+    def add(self, item):
+        """Append an item (a dict of fields); missing fields default to 0, False or "".
+
+        Returns its row number. Raises ValueError for a duplicate name and
+        OverflowError for a number outside 16 bits.
+        """
+        name = item["name"]
+        if name in self.rows:
+            raise ValueError(f"duplicate item {name!r}")
+        row = len(self.rows)
+        columns = self.columns
+        get = item.get
+        numbers = [int(get(field, 0)) for field in NUMERIC_FIELDS]
+        if not all(NUMBER_MIN <= n <= NUMBER_MAX for n in numbers):
+            raise OverflowError(f"{name!r}: a number is outside {NUMBER_MIN}..{NUMBER_MAX}")
+        for field, value in zip(NUMERIC_FIELDS, numbers):
+            columns[field].append(value)
+        for field in FLAG_FIELDS:
+            columns[field].append(get(field, False))
+        for field in CATEGORY_FIELDS:
+            columns[field].append(get(field, ""))
+        for field in TEXT_FIELDS:
+            columns[field].append(sys.intern(get(field, "")))
+        for field, index in self.indexes.items():
+            index.setdefault(columns[field][row], array("I")).append(row)
+        self.rows[name] = row
+        return row
+
+    # --- Mapping ---
+    def __getitem__(self, name):
+        row = self.rows.get(name)
+        if row is not None:
+            return ItemView(self, row)
+        return self.cooked_variant(name)
+
+    def __contains__(self, name):
+        return name in self.rows or self.split_cooked(name) is not None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # --- Columns and queries ---
+    def view(self, row):
+        return ItemView(self, row)
+
+    def value(self, name, field):
+        """One field of one item, without building a view."""
+        row = self.rows.get(name)
+        if row is not None:
+            return self.columns[field][row]
+        return self.cooked_variant(name)[field]
+
+    # --- Cooked variants ---
+    def split_cooked(self, name):
+        """(method, raw item name) for a cooked name of a stored item, else None."""
+        method, _, raw = name.partition("_")
+        if method in COOKING_METHODS and raw in self.rows:
+            return method, raw
+        return None
+
+    def cooked(self, raw, method):
+        """The CookedItem for `raw` cooked by `method`."""
+        return self.cooked_variant(f"{method}_{raw}")
+
+    def cooked_variant(self, name):
+        cache = self.cooked_cache
+        item = cache.get(name)
+        if item is not None:
+            cache.move_to_end(name)
+            return item
+        split = self.split_cooked(name)
+        if split is None:
+            raise KeyError(name)
+        method, raw = split
+        item = cache[name] = CookedItem(ItemView(self, self.rows[raw]), method, name)
+        if len(cache) > COOKED_CACHE_SIZE:
+            cache.popitem(last=False)
+        return item
+
+    def column(self, field, rows=None):
+        """A field's values for the given rows (all rows by default)."""
+        column = self.columns[field]
+        if rows is None:
+            rows = range(len(self.rows))
+        return pick(column, rows)
+
+    def values_of(self, field):
+        """The distinct values of an indexed field."""
+        return list(self.indexes[field])
+
+    def rows_where(self, min_toxicity=None, max_toxicity=None, **equals):
+        """Sorted row numbers matching every condition.
+
+        Keyword arguments are indexed fields and the value each must equal,
+        e.g. rows_where(region="Subalpine Forest", category="mushroom").
+        min_toxicity and max_toxicity bound toxicity_level inclusively.
+        """
+        sets = []
+        for field, wanted in equals.items():
+            if field not in self.indexes:
+                raise KeyError(f"{field!r} is not an indexed field")
+            sets.append(self.indexes[field].get(wanted, ()))
+        if min_toxicity is not None or max_toxicity is not None:
+            low = float("-inf") if min_toxicity is None else min_toxicity
+            high = float("inf") if max_toxicity is None else max_toxicity
+            levels = self.indexes["toxicity_level"]
+            matching = [rows for level, rows in levels.items() if low <= level <= high]
+            sets.append(matching[0] if len(matching) == 1 else sorted(chain.from_iterable(matching)))
+        if not sets:
+            return list(range(len(self.rows)))
+        if len(sets) == 1:
+            return list(sets[0])
+        sets.sort(key=len)
+        return sorted(set(sets[0]).intersection(*sets[1:]))
+
+    def where(self, **conditions):
+        """Names of the items matching rows_where(**conditions), in catalog order."""
+        return pick(self.columns["name"], self.rows_where(**conditions))
+
+def pick(column, rows):
+    """column[row] for each row, gathered in C."""
+    if len(rows) < 2:
+        return [column[row] for row in rows]
+    return list(itemgetter(*rows)(column))
@@ -0,0 +1,253 @@
+import csv
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+from catalog import ItemCatalog
+from tables import load_table
+from weather import AliasTable
+
+# === Content Bundle ===
+# Every CSV under data/ is validated, type-converted and pickled into a
+# single bundle file. Startup is then one read + unpickle. The bundle keeps
+# each source's (mtime, size, sha1) and is rebuilt when a source changes.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+BUNDLE_NAME = "content.bundle"
+BUNDLE_VERSION = 7  # bump whenever a loader's output changes
+
+DEFAULT_RARITY = 3  # items.csv has no rarity column yet
+
+WEATHER_COLS = ['clear', 'rain', 'fog', 'storm', 'cold', 'wind']
+WEATHER_PERSISTENCE = 0.0  # for biomes without a weather_persistence column; 0 = independent hours
+
+STAT_LEVELS = ("low", "med", "high")  # action word levels, by the stat behind the action
+
+class ContentError(ValueError):
+    """A source CSV failed validation."""
+
+def parse_bool(value, where):
+    text = value.strip().lower()
+    if text not in ("true", "false"):
+        raise ContentError(f"{where}: expected True/False, got {value!r}")
+    return text == "true"
+
+def parse_number(value, where, kind=int):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ContentError(f"{where}: expected {kind.__name__}, got {value!r}") from None
+
+def require_columns(table, path, columns):
+    missing = [c for c in columns if c not in table.columns]
+    if missing:
+        raise ContentError(f"{path}: missing column(s) {', '.join(missing)}")
+
+# === Loaders ===
+def load_items(path="data/items.csv"):
+    """items.csv as an ItemCatalog (typed columns; see catalog.py)."""
+    items = ItemCatalog()
+    with open(path, newline='', encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for line, row in enumerate(reader, 2):
+            where = f"{path}:{line}"
+            # Convert booleans and numeric fields
+            for field in ("identified", "plant_guide_feature", "requires_cooking", "edible_raw"):
+                row[field] = parse_bool(row[field], f"{where} {field}")
+            for field in ("toxicity_level", "hunger", "morale", "energy"):
+                row[field] = parse_number(row[field], f"{where} {field}")
+            row["min_perception_to_identify"] = parse_number(
+                row.get("min_perception_to_identify", 0), f"{where} min_perception_to_identify")
+            row["rarity"] = parse_number(row.get("rarity") or DEFAULT_RARITY, f"{where} rarity")
+            if row["name"] in items:
+                raise ContentError(f"{where}: duplicate item {row['name']!r}")
+            try:
+                items.add(row)
+            except OverflowError:
+                raise ContentError(f"{where}: a number is out of range") from None
+    return items
+
+def load_biomes(path="data/biomes.csv"):
+    numeric = {col: float for col in ["base_hours", "avg_angle_deg"] + WEATHER_COLS}
+    table = load_table(path, converters=numeric)
+    require_columns(table, path, ["biome_name", "intro_text"])
+    # Normalize weather probabilities per row to sum to 1.0 (optional safeguard)
+    for row in table:
+        total = sum(row[col] for col in WEATHER_COLS)
+        if total <= 0:
+            raise ContentError(f"{path}: {row['biome_name']} has no weather weights")
+        for col in WEATHER_COLS:
+            row[col] = row[col] / total
+        # Sampling table (see weather.py); draws are weather names
+        weights = [row[col] for col in WEATHER_COLS]
+        persistence = parse_number(row.get("weather_persistence") or WEATHER_PERSISTENCE,
+                                   f"{path}: {row['biome_name']} weather_persistence", float)
+        if not 0 <= persistence < 1:
+            raise ContentError(f"{path}: {row['biome_name']} weather_persistence must be in [0, 1)")
+        row["weather_persistence"] = persistence
+        row["weather_table"] = AliasTable(weights, WEATHER_COLS)
+    return table
+
+def load_templates(path="data/narrative_templates.csv"):
+    table = load_table(path)
+    require_columns(table, path, ["context", "template", "type"])
+    for line, row in enumerate(table, 2):
+        if row["template"].count("{") != row["template"].count("}"):
+            raise ContentError(f"{path}:{line}: unbalanced braces in {row['template']!r}")
+    return table
+
+def load_action_words(path="data/action_word_variations.csv"):
+    """(action_type, level) -> tuple of variations, in file order."""
+    table = load_table(path)
+    require_columns(table, path, ["action_type", "level", "variation"])
+    words = {}
+    for line, row in enumerate(table, 2):
+        if row["level"] not in STAT_LEVELS:
+            raise ContentError(f"{path}:{line}: level must be one of {', '.join(STAT_LEVELS)}, got {row['level']!r}")
+        words.setdefault((row["action_type"], row["level"]), []).append(sys.intern(row["variation"]))
+    return {key: tuple(variations) for key, variations in words.items()}
+
+# name -> (file, loader); ambient tables only need their columns checked
+SOURCES = {
+    "items": ("items.csv", load_items),
+    "biomes": ("biomes.csv", load_biomes),
+    "narrative_templates": ("narrative_templates.csv", load_templates),
+    "action_words": ("action_word_variations.csv", load_action_words),
+    "ambient_base": ("ambient_base.csv", ["base_phrase", "category", "weather_condition"]),
+    "ambient_modifier": ("ambient_modifier.csv", ["stat_type", "stat_level", "modifier_phrase"]),
+    "ambient_response": ("ambient_response.csv", ["category", "response_phrase"]),
+}
+
+def compile_content(data_dir=DATA_DIR):
+    """Load, validate and convert every source table. Returns name -> table."""
+    content = {}
+    for name, (filename, loader) in SOURCES.items():
+        path = os.path.join(data_dir, filename)
+        if callable(loader):
+            content[name] = loader(path)
+        else:
+            table = load_table(path)
+            require_columns(table, path, loader)
+            content[name] = table
+    return content
+
+# === Bundle I/O ===
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def source_manifest(data_dir):
+    manifest = {}
+    for filename, _ in SOURCES.values():
+        path = os.path.join(data_dir, filename)
+        st = os.stat(path)
+        manifest[filename] = (st.st_mtime_ns, st.st_size, file_hash(path))
+    return manifest
+
+def content_digest(data_dir=DATA_DIR):
+    """20-byte digest over every source's sha1; changes whenever any content does."""
+    manifest = source_manifest(data_dir)
+    return hashlib.sha1("".join(manifest[name][2] for name in sorted(manifest)).encode()).digest()
+
+def write_bundle(bundle_path, manifest, content):
+    # A temp file of our own, so processes rebuilding at once never share one
+    directory, name = os.path.split(os.path.abspath(bundle_path))
+    with tempfile.NamedTemporaryFile("wb", dir=directory, prefix=name + ".", suffix=".tmp", delete=False) as f:
+        tmp = f.name
+        try:
+            pickle.dump({"version": BUNDLE_VERSION, "sources": manifest, "content": content},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    # NamedTemporaryFile makes the file 0600; give the bundle the mode open() would
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, bundle_path)
+    except OSError:
+        os.unlink(tmp)
+        raise
+
+def build_bundle(data_dir=DATA_DIR, bundle_path=None):
+    bundle_path = bundle_path or os.path.join(data_dir, BUNDLE_NAME)
+    manifest = source_manifest(data_dir)
+    content = compile_content(data_dir)
+    write_bundle(bundle_path, manifest, content)
+    return content
+
+def bundle_is_fresh(bundle, data_dir):
+    """Check stored (mtime, size) first; only rehash sources whose stat changed.
+
+    Returns (fresh, touched): touched means some mtimes moved but the
+    hashes still match, so the manifest should be rewritten.
+    """
+    if bundle.get("version") != BUNDLE_VERSION:
+        return False, False
+    sources = bundle.get("sources", {})
+    touched = False
+    for filename, _ in SOURCES.values():
+        path = os.path.join(data_dir, filename)
+        if filename not in sources:
+            return False, False
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False, False
+        mtime_ns, size, digest = sources[filename]
+        if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+            continue
+        if st.st_size != size or file_hash(path) != digest:
+            return False, False
+        touched = True
+    return True, touched
+
+def load_content(data_dir=DATA_DIR, bundle_path=None):
+    """Content tables from the bundle, rebuilding it if any source changed."""
+    bundle_path = bundle_path or os.path.join(data_dir, BUNDLE_NAME)
+    try:
+        with open(bundle_path, "rb") as f:
+            bundle = pickle.loads(f.read())
+    except (OSError, pickle.UnpicklingError, EOFError,
+            AttributeError, ImportError, ValueError, TypeError, IndexError, KeyError):
+        bundle = None  # missing, truncated, or pickled by code that has since changed
+
+    if isinstance(bundle, dict):
+        fresh, touched = bundle_is_fresh(bundle, data_dir)
+        if fresh:
+            if touched:
+                try:
+                    write_bundle(bundle_path, source_manifest(data_dir), bundle["content"])
+                except OSError:
+                    pass
+            return bundle["content"]
+
+    try:
+        return build_bundle(data_dir, bundle_path)
+    except OSError:
+        # Read-only data dir: still run, just without caching
+        return compile_content(data_dir)
+
+_content = None
+
+def get_content():
+    """The process-wide content, loaded once."""
+    global _content
+    if _content is None:
+        _content = load_content()
+    return _content
+
+if __name__ == "__main__":
+    # python content.py [data_dir]  — validate sources and rebuild the bundle
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    try:
+        built = build_bundle(data_dir)
+    except ContentError as e:
+        sys.exit(f"Content error: {e}")
+    for name, table in built.items():
+        print(f"  {name:<20} {len(table):>6} rows")
+    print(f"Wrote {os.path.join(data_dir, BUNDLE_NAME)}")
@@ -0,0 +1,84 @@
+import random
+
+from journal import NarrativeLog
+
+# === Game State ===
+# Everything that belongs to one run lives on a GameState, so any number of
+# sessions can share a process. Content tables (items, biomes, templates)
+# are read-only and stay module-level; a state only references its biome row.
+
+STARTING_INVENTORY = {
+    "jerky": 3,
+    "flint_and_steel": 1,
+    "tinder": 1,
+    "pot": 1
+}
+
+class GameState:
+    """One player's run. Slots keep a session to a few hundred bytes plus its containers."""
+    __slots__ = (
+        # --- Environment & Time ---
+        "current_hour", "hours_since_sleep", "hours_walked", "required_hours",
+        "current_biome_index", "current_biome", "weather_index",
+        # --- Player Core Stats ---
+        "energy", "hunger", "morale", "has_fire", "fire_hours_remaining",
+        # --- Run Outcome ---
+        "total_hours", "cause_of_death", "reached_summit",
+        # --- Perception Stats ---
+        "visual_xp", "auditory_xp", "visual_level", "auditory_level",
+        "player_perception", "perception_xp", "perception_wait_flags",
+        # --- Inventory & Progress ---
+        "inventory", "identified_items", "cooked_items", "narrative_history", "recent_templates",
+        # per-session randomness, so sessions never share a generator
+        "rng",
+        # where menus print to: print() for the terminal, a socket buffer when served
+        "out",
+    )
+
+    def __init__(self, biome_table, seed=None, inventory=None, journal_path=None):
+        self.current_hour = 6
+        self.hours_since_sleep = 0
+        self.hours_walked = 0
+        self.required_hours = None
+        self.current_biome_index = 0
+        self.current_biome = biome_table[0]
+        self.weather_index = -1       # last hour's weather (index into WEATHER_COLS); -1 before the first
+
+        self.energy = 80
+        self.hunger = 80
+        self.morale = 70
+        self.has_fire = False
+        self.fire_hours_remaining = 0
+
+        self.total_hours = 0          # hours elapsed since the start of the run
+        self.cause_of_death = None    # set by lethal events, e.g. "poisoning"
+        self.reached_summit = False
+
+        self.visual_xp = 0
+        self.auditory_xp = 0
+        self.visual_level = 0
+        self.auditory_level = 0
+        self.player_perception = {"visual": 1, "auditory": 1}
+        self.perception_xp = {"visual": 0.0, "auditory": 0.0}
+        self.perception_wait_flags = {"visual": False, "auditory": False}
+
+        self.inventory = dict(STARTING_INVENTORY if inventory is None else inventory)
+        self.identified_items = set(self.inventory)
+        self.cooked_items = set()
+        self.narrative_history = NarrativeLog(journal_path=journal_path)
+        self.recent_templates = {}
+
+        self.rng = random.Random(seed)
+        self.out = print
+
+    def status(self):
+        """None while the run continues, else why it ended."""
+        if self.reached_summit:
+            return "summit"
+        if self.cause_of_death:
+            return self.cause_of_death
+        if self.hunger <= 0:
+            return "starvation"
+        if self.energy <= 0:
+            return "exhaustion"
+        return None
@@ -0,0 +1,197 @@
+"""Opt-in timing of actions and the subsystems under them.
+
+Nothing is wrapped until install() runs, so a normal game pays nothing.
+Once installed, each listed function records its wall time (inclusive of
+anything it calls) into the current Profiler: a call count, total, max
+and a log-scale histogram per name, from which percentiles are read.
+
+    TEXTRPG_PROFILE=1 python RPGTEST8.py             # table at exit
+    TEXTRPG_PROFILE=turns.json python RPGTEST8.py    # table, plus a JSON dump
+    python server.py --profile-dir profiles/         # one JSON per session
+    python replay.py lastrun.replay --profile        # profile a recorded run
+"""
+import functools
+import json
+import sys
+from time import perf_counter_ns
+
+# What gets timed, by module and dotted attribute. "game" is the module
+# passed to install(): RPGTEST8, or __main__ when run as a script.
+ACTIONS = ("eat", "travel", "forage", "wait_hours", "sleep_hours", "start_fire", "tend_fire", "cook")
+SUBSYSTEMS = (
+    ("game", "narrative_from_template"),
+    ("game", "advance_time"),
+    ("game", "draw_weather"),
+    ("game", "describe_ambient_scene"),
+    ("game", "split_screen"),
+    ("render", "FrameRenderer.render"),
+    ("savegame", "SaveFile.save"),
+    ("replay", "ActionRecorder.record"),
+)
+TURN = "turn"  # one input line, from receiving it to the next prompt
+
+# Histogram: four buckets per power of two of nanoseconds (about ±9%)
+SUB_BUCKETS = 4
+BUCKETS = 64 * SUB_BUCKETS
+
+def bucket_of(ns):
+    bits = ns.bit_length()
+    if bits <= 3:
+        return ns
+    return (bits - 2) * SUB_BUCKETS + ((ns >> (bits - 3)) & 3)
+
+def bucket_upper(index):
+    """Largest duration (ns) that lands in bucket `index`."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    bits, sub = divmod(index, SUB_BUCKETS)
+    bits += 2
+    return ((SUB_BUCKETS + sub + 1) << (bits - 3)) - 1
+
+# === Profiler ===
+class Timer:
+    __slots__ = ("count", "total", "max", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.histogram = [0] * BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        self.histogram[bucket_of(ns)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, p):
+        """Upper bound (ns) of the bucket holding the p-th percentile."""
+        rank = p / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.histogram):
+            seen += n
+            if n and seen >= rank:
+                return min(bucket_upper(index), self.max)
+        return self.max
+
+class Profiler:
+    """Timers by name for one session (or a merge of several)."""
+    __slots__ = ("timers", "sessions")
+
+    def __init__(self):
+        self.timers = {}
+        self.sessions = 1
+
+    def add(self, name, ns):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        timer.add(ns)
+
+    def merge(self, other):
+        for name, timer in other.timers.items():
+            self.timers.setdefault(name, Timer()).merge(timer)
+        self.sessions += other.sessions
+
+    def kind(self, name):
+        if name == TURN:
+            return "turn"
+        return "action" if name in ACTIONS else "subsystem"
+
+    def to_dict(self):
+        timers = {}
+        for name, t in sorted(self.timers.items()):
+            timers[name] = {
+                "kind": self.kind(name),
+                "count": t.count,
+                "total_ns": t.total,
+                "mean_ns": t.total // t.count,
+                "p50_ns": t.percentile(50),
+                "p90_ns": t.percentile(90),
+                "p99_ns": t.percentile(99),
+                "max_ns": t.max,
+                # [bucket upper bound in ns, calls], non-empty buckets only
+                "histogram": [[bucket_upper(i), n] for i, n in enumerate(t.histogram) if n],
+            }
+        return {"sessions": self.sessions, "timers": timers}
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def table(self):
+        lines = [f"{'':<26}{'calls':>8}{'total ms':>11}{'mean µs':>10}{'p50 µs':>9}{'p99 µs':>9}{'max µs':>10}"]
+        for kind in ("turn", "action", "subsystem"):
+            rows = [(name, t) for name, t in self.timers.items() if self.kind(name) == kind]
+            if not rows:
+                continue
+            lines.append(f"--- {kind} ---")
+            for name, t in sorted(rows, key=lambda row: -row[1].total):
+                lines.append(f"{name:<26}{t.count:>8}{t.total / 1e6:>11.1f}{t.total / t.count / 1e3:>10.1f}"
+                             f"{t.percentile(50) / 1e3:>9.1f}{t.percentile(99) / 1e3:>9.1f}{t.max / 1e3:>10.1f}")
+        return "\n".join(lines)
+
+current = None  # the Profiler timed calls record into; drivers swap it per session
+installed = []  # (owner, attribute, original) for uninstall()
+
+# === Wrapping ===
+def timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            current.add(name, perf_counter_ns() - start)
+    return wrapper
+
+def timed_menu(menu):
+    """Wrap a menu generator, timing each input line it handles as a turn."""
+    try:
+        line = yield next(menu)
+        while True:
+            start = perf_counter_ns()
+            try:
+                prompt = menu.send(line)
+            except StopIteration:
+                return
+            finally:
+                current.add(TURN, perf_counter_ns() - start)
+            line = yield prompt
+    finally:
+        menu.close()
+
+def install(game, profiler=None):
+    """Time ACTIONS and SUBSYSTEMS from now on; returns the current Profiler.
+
+    Modules in SUBSYSTEMS that aren't imported yet are skipped.
+    """
+    global current
+    current = profiler or current or Profiler()
+    if installed:
+        return current
+    modules = {"game": game}
+    targets = [("game", name) for name in ACTIONS] + list(SUBSYSTEMS)
+    for module_name, path in targets:
+        owner = modules.get(module_name) or sys.modules.get(module_name)
+        if owner is None:
+            continue
+        *parents, attribute = path.split(".")
+        for parent in parents:
+            owner = getattr(owner, parent)
+        original = getattr(owner, attribute)
+        setattr(owner, attribute, timed(attribute if module_name == "game" else path, original))
+        installed.append((owner, attribute, original))
+    return current
+
+def uninstall():
+    while installed:
+        owner, attribute, original = installed.pop()
+        setattr(owner, attribute, original)
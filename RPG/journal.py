@@ -0,0 +1,154 @@
+import gzip
+import json
+import os
+import zlib
+from bisect import bisect
+from collections import deque
+from itertools import islice
+
+# === Narrative Log ===
+# A session keeps only the recent tail of its narrative in memory. Older
+# entries are spilled to an append-only gzip journal (one JSON string per
+# line), written a batch at a time; each batch becomes one gzip member,
+# which gzip reads back as a single stream.
+#
+# The log also remembers where each batch starts: its byte offset in the
+# file and the number of its first entry. A page of old narrative seeks to
+# the batch holding its first entry and decompresses from there, rather
+# than the whole journal. An existing journal (a resumed game) is indexed
+# once, on first use, by walking its members.
+
+NARRATIVE_TAIL = 100  # entries kept in memory; the screen shows the last 10
+SPILL_BATCH = 64      # entries per journal write
+
+class NarrativeLog:
+    """The recent narrative as a bounded list; older entries go to a journal.
+
+    Appending, extending, len() and indexing/slicing work on the in-memory
+    tail like a list. Without a journal path, old entries are dropped.
+    """
+    __slots__ = ("tail", "journal_path", "pending", "journaled", "count", "batch_starts", "batch_offsets")
+
+    def __init__(self, entries=(), capacity=NARRATIVE_TAIL, journal_path=None):
+        self.tail = deque(maxlen=capacity)
+        self.journal_path = journal_path
+        self.pending = []   # spilled, not yet written
+        self.journaled = 0  # entries written to the journal
+        self.count = 0      # entries ever appended, kept or not
+        self.batch_starts = None   # first entry number of each batch; None until indexed
+        self.batch_offsets = None  # byte offset of each batch in the journal
+        self.extend(entries)
+
+    def append(self, entry):
+        tail = self.tail
+        if len(tail) == tail.maxlen and self.journal_path:
+            self.pending.append(tail[0])
+            if len(self.pending) >= SPILL_BATCH:
+                self.flush()
+        tail.append(entry)
+        self.count += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self.tail)
+
+    def __iter__(self):
+        return iter(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.tail))
+            if step == 1:
+                return list(islice(self.tail, start, stop))
+            return list(self.tail)[index]
+        return self.tail[index]
+
+    @property
+    def total(self):
+        """Entries still reachable: journaled, pending and in memory."""
+        if self.journal_path:
+            self.index_journal()
+        return self.journaled + len(self.pending) + len(self.tail)
+
+    def index_journal(self):
+        """Build the batch index, reading a journal left by an earlier session."""
+        if self.batch_starts is not None:
+            return
+        starts, offsets = [], []
+        journaled = 0
+        path = self.journal_path
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            view = memoryview(data)
+            offset = 0
+            while offset < len(data):
+                d = zlib.decompressobj(zlib.MAX_WBITS | 16)  # one gzip member
+                try:
+                    lines = d.decompress(view[offset:]).count(b"\n")
+                except zlib.error:
+                    d = None
+                if d is None or not d.eof:
+                    # Torn final batch: drop it so later batches append cleanly
+                    os.truncate(path, offset)
+                    break
+                starts.append(journaled)
+                offsets.append(offset)
+                journaled += lines
+                offset = len(data) - len(d.unused_data)
+        self.batch_starts, self.batch_offsets = starts, offsets
+        self.journaled = journaled
+
+    def flush(self):
+        """Write spilled entries to the journal as one compressed batch."""
+        if not self.pending:
+            return
+        self.index_journal()
+        data = "".join(json.dumps(entry) + "\n" for entry in self.pending).encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            offset = f.tell()
+            f.write(gzip.compress(data))
+        self.batch_starts.append(self.journaled)
+        self.batch_offsets.append(offset)
+        self.journaled += len(self.pending)
+        self.pending.clear()
+
+    def journal_entries(self, start=0):
+        """Iterate the journaled entries from number `start`, oldest first."""
+        self.flush()
+        if not self.journal_path:
+            return
+        self.index_journal()
+        if start >= self.journaled:
+            return
+        batch = bisect(self.batch_starts, start) - 1
+        with open(self.journal_path, "rb") as raw:
+            raw.seek(self.batch_offsets[batch])
+            with gzip.open(raw, "rt", encoding="utf-8") as f:
+                for line in islice(f, start - self.batch_starts[batch], None):
+                    yield json.loads(line)
+
+    def page(self, number, size=10):
+        """Page `number` back from the newest entries (0 is the latest); [] past the start."""
+        skip = number * size
+        if skip + size <= len(self.tail):
+            return list(self.tail)[len(self.tail) - skip - size:len(self.tail) - skip]
+        # Reach into the journal, starting at the batch that holds the page's first entry
+        self.flush()
+        if self.journal_path:
+            self.index_journal()
+        journaled = self.journaled
+        end = journaled + len(self.tail) - skip
+        if end <= 0:
+            return []
+        start = max(0, end - size)
+        if start >= journaled:
+            return list(self.tail)[start - journaled:end - journaled]
+        older = list(islice(self.journal_entries(start), min(end, journaled) - start))
+        return older + list(islice(self.tail, 0, max(0, end - journaled)))
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,169 @@
+"""Local load test for server.py.
+
+Opens many sessions at once: active ones play a scripted loop of menu
+commands as fast as the server answers (or with --think delay), idle ones
+connect and sit at the first prompt. Reports action latency percentiles
+and, when it started the server itself, server CPU, memory and sessions
+per core.
+
+    python loadtest.py --active 500 --idle 2000 --seconds 20
+    python loadtest.py --port 4000 --active 100   # against a running server
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from server import GO_AHEAD, raise_open_file_limit
+
+# Mostly travel, with a camp -> rest -> sleep 8 hours detour to stay alive
+SCRIPT = ["2", "2", "2", "2", "2", "3", "1", "2", "8", "5", "5"]
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+async def connect(target):
+    if target[0] == "unix":
+        return await asyncio.open_unix_connection(target[1])
+    return await asyncio.open_connection(target[1], target[2])
+
+async def read_prompt(reader):
+    """Read one reply; None if the server closed the session (game over)."""
+    try:
+        return await reader.readuntil(GO_AHEAD)
+    except asyncio.IncompleteReadError:
+        return None
+
+async def active_session(target, deadline, think, latencies, counters):
+    step = 0
+    while time.monotonic() < deadline:
+        reader, writer = await connect(target)
+        counters["games"] += 1
+        try:
+            if await read_prompt(reader) is None:
+                continue
+            while time.monotonic() < deadline:
+                command = SCRIPT[step % len(SCRIPT)]
+                step += 1
+                start = time.perf_counter()
+                writer.write(command.encode() + b"\r\n")
+                reply = await read_prompt(reader)
+                latencies.append(time.perf_counter() - start)
+                if reply is None:
+                    break  # game over, start another
+                if think:
+                    await asyncio.sleep(think)
+        finally:
+            writer.close()
+
+async def idle_session(target, stop, counters):
+    reader, writer = await connect(target)
+    await read_prompt(reader)
+    counters["idle"] += 1
+    await stop.wait()
+    writer.close()
+
+def proc_cpu_seconds(pid):
+    """utime + stime of a process, from /proc (Linux); None elsewhere."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def proc_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def start_server(path):
+    server_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+    proc = subprocess.Popen([sys.executable, server_py, "--unix", path],
+                            cwd=os.path.dirname(server_py), stdout=subprocess.PIPE, text=True)
+    for line in proc.stdout:  # wait until it's listening
+        if line.startswith("Serving on"):
+            return proc
+    raise RuntimeError("server exited before it started listening")
+
+async def run(target, active, idle, seconds, think, server_pid=None):
+    counters = {"games": 0, "idle": 0}
+    latencies = []
+    stop = asyncio.Event()
+
+    idle_tasks = [asyncio.create_task(idle_session(target, stop, counters)) for _ in range(idle)]
+    while counters["idle"] < idle:  # everyone connected before the clock starts
+        await asyncio.sleep(0.05)
+    rss_idle = proc_rss_mb(server_pid) if server_pid else None
+
+    cpu_start = proc_cpu_seconds(server_pid) if server_pid else None
+    start = time.monotonic()
+    deadline = start + seconds
+    await asyncio.gather(*(active_session(target, deadline, think, latencies, counters) for _ in range(active)))
+    wall = time.monotonic() - start
+    cpu_end = proc_cpu_seconds(server_pid) if server_pid else None
+    rss_end = proc_rss_mb(server_pid) if server_pid else None
+
+    stop.set()
+    await asyncio.gather(*idle_tasks)
+    return latencies, counters, wall, cpu_start, cpu_end, rss_idle, rss_end
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the game server.")
+    parser.add_argument("--active", type=int, default=200, help="sessions sending actions")
+    parser.add_argument("--idle", type=int, default=1000, help="sessions that connect and wait")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--think", type=float, default=0, help="seconds between an active session's actions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use a running TCP server")
+    parser.add_argument("--unix", help="use a running Unix socket server")
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+    proc = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.unix:
+            target = ("unix", args.unix)
+        elif args.port:
+            target = ("tcp", args.host, args.port)
+        else:
+            path = os.path.join(tmp, "textrpg.sock")
+            proc = start_server(path)
+            target = ("unix", path)
+        try:
+            latencies, counters, wall, cpu_start, cpu_end, rss_idle, rss_end = asyncio.run(
+                run(target, args.active, args.idle, args.seconds, args.think, proc.pid if proc else None))
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
+
+    latencies.sort()
+    actions = len(latencies)
+    print(f"\n== {args.active} active + {args.idle} idle sessions, {wall:.1f} s ==")
+    print(f"  actions           : {actions:,} ({actions / wall:,.0f}/s), {counters['games']:,} games started")
+    print(f"  latency p50       : {percentile(latencies, 50) * 1000:8.2f} ms")
+    print(f"  latency p99       : {percentile(latencies, 99) * 1000:8.2f} ms")
+    print(f"  latency max       : {(latencies[-1] if latencies else 0) * 1000:8.2f} ms")
+    if cpu_start is not None and cpu_end is not None and cpu_end > cpu_start:
+        cpu = cpu_end - cpu_start
+        print(f"  server CPU        : {cpu:.2f} s ({cpu / wall:.0%} of one core)")
+        print(f"  actions per core  : {actions / cpu:,.0f}/s")
+        # Sessions one core could carry at this per-session action rate
+        print(f"  sessions per core : {args.active * wall / cpu:,.0f} active at this pace")
+    if rss_idle is not None:
+        print(f"  server RSS        : {rss_idle:.1f} MB with idle sessions, {rss_end:.1f} MB at the end")
+
+if __name__ == "__main__":
+    main()
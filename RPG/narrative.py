@@ -0,0 +1,208 @@
+import re
+import random
+import weakref
+from collections import deque
+from functools import lru_cache
+
+# === Phrase Resolvers ===
+# Each template slot is a phrase registered with a bucket function. The
+# bucket reduces a game_state dict to the few values the phrase depends on
+# (threshold bands, weather, fire, biome); the phrase itself is computed from
+# the bucket only, so results are cached per bucket and shared by every
+# session. A repeated bucket costs one dict lookup.
+
+PHRASE_RESOLVERS = {}
+PHRASE_CACHES = {}
+COMPILED_TEMPLATES = weakref.WeakSet()  # live CompiledTemplates, rebound on registration
+
+def register_phrase(key, bucket):
+    """Decorator: register `phrase(bucket_value) -> str` as the resolver for {key}.
+
+    Templates bind resolvers when compiled; registering a key rebinds the
+    live templates that use it, including those already cached or held by a
+    TemplateSelector, so late registrations are picked up.
+    """
+    def decorator(phrase):
+        cache = {}
+
+        def resolve(s):
+            b = bucket(s)
+            try:
+                return cache[b]
+            except KeyError:
+                text = cache[b] = phrase(b)
+                return text
+
+        PHRASE_RESOLVERS[key] = resolve
+        PHRASE_CACHES[key] = cache
+        for template in list(COMPILED_TEMPLATES):
+            if key in template.keys:
+                template.bind()
+        return phrase
+    return decorator
+
+def clear_phrase_cache():
+    for cache in PHRASE_CACHES.values():
+        cache.clear()
+
+WEATHER_FEELINGS = {
+    "rain": "Rain clings to your gear.",
+    "fog": "The fog dulls everything.",
+    "storm": "Thunder rolls overhead.",
+    "cold": "Your breath fogs the air.",
+    "clear": "The sky is still.",
+    "wind": "Wind pushes against you."
+}
+
+@register_phrase("hunger_level", lambda s: 0 if s['hunger'] < 30 else 1 if s['hunger'] < 60 else 2)
+def hunger_level(b):
+    return ("you’re starving", "you’re a bit hungry", "you feel fine")[b]
+
+@register_phrase("morale_reaction", lambda s: 0 if s['morale'] < 30 else 1 if s['morale'] < 60 else 2)
+def morale_reaction(b):
+    return ("You feel bleak.", "You doubt yourself.", "You’re steady.")[b]
+
+@register_phrase("energy_feeling", lambda s: s['energy'] >= 40)
+def energy_feeling(b):
+    return ("You move slowly.", "You’re still alert.")[b]
+
+@register_phrase("weather_feeling", lambda s: s['weather'])
+def weather_feeling(weather):
+    return WEATHER_FEELINGS.get(weather, "The weather presses in.")
+
+@register_phrase("fire_status", lambda s: bool(s['has_fire']))
+def fire_status(fire):
+    return "The fire burns low." if fire else "No fire. Just cold."
+
+@register_phrase("dream_hint", lambda s: s['morale'] >= 40)
+def dream_hint(b):
+    return ("Dreams flicker and vanish.", "Sleep holds nothing.")[b]
+
+def biome_bucket(s):
+    biome = s['biome']
+    return biome["biome_name"] if isinstance(biome, dict) or "biome_name" in biome else str(biome)
+
+@register_phrase("biome", biome_bucket)
+def biome_name(name):
+    return name
+
+def resolver_for(key):
+    resolver = PHRASE_RESOLVERS.get(key)
+    if resolver is None:
+        undefined = f"<undefined:{key}>"
+        return lambda s: undefined
+    return resolver
+
+class PhraseBuilder:
+    def __init__(self, game_state):
+        self.s = game_state  # shorthand
+
+    def get(self, key):
+        # Only the requested phrase is resolved
+        return resolver_for(key)(self.s)
+
+# === Compiled Templates ===
+SLOT_PATTERN = re.compile(r"\{([^{}]*)\}")
+
+class CompiledTemplate:
+    """A template split once into literal text and bound slot resolvers."""
+    __slots__ = ("source", "head", "keys", "literals", "slots", "__weakref__")
+
+    def __init__(self, source):
+        self.source = source
+        pieces = SLOT_PATTERN.split(source)  # literal, key, literal, key, ..., literal
+        self.head = pieces[0]
+        self.keys = tuple(pieces[1::2])
+        self.literals = tuple(pieces[2::2])
+        self.bind()
+        COMPILED_TEMPLATES.add(self)
+
+    def bind(self):
+        """(Re)bind each slot to its key's current resolver."""
+        self.slots = tuple(zip(map(resolver_for, self.keys), self.literals))
+
+    def fill(self, game_state):
+        if not self.slots:
+            return self.head
+        out = [self.head]
+        for resolve, literal in self.slots:
+            out.append(resolve(game_state))
+            out.append(literal)
+        return "".join(out)
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.source!r})"
+
+@lru_cache(maxsize=1024)
+def compile_template(source):
+    return CompiledTemplate(source)
+
+def compile_templates(templates):
+    """Compile every template string once, keyed by its source text."""
+    return {t: compile_template(t) for t in templates}
+
+# === Template Selection ===
+class RecentTemplates:
+    """Recently used templates for one context: insertion order plus O(1) membership."""
+    __slots__ = ("order", "counts")
+
+    def __init__(self):
+        self.order = deque()
+        self.counts = {}
+
+    def __contains__(self, template):
+        return template in self.counts
+
+    def push(self, template, max_recent):
+        self.order.append(template)
+        self.counts[template] = self.counts.get(template, 0) + 1
+        while len(self.order) > max_recent:
+            old = self.order.popleft()
+            if self.counts[old] == 1:
+                del self.counts[old]
+            else:
+                self.counts[old] -= 1
+
+class TemplateSelector:
+    """Prebuilt (context, require_stat) -> templates index for narrative_from_template."""
+
+    def __init__(self, rows):
+        stat_only = {}
+        any_type = {}
+        for row in rows:
+            compiled = compile_template(row["template"])
+            kind = row.get("type")
+            # Rows without a type are never filtered out, as before
+            if kind in ("stat", None):
+                stat_only.setdefault(row["context"], []).append(compiled)
+            if kind in ("universal", "stat", None):
+                any_type.setdefault(row["context"], []).append(compiled)
+        # Each entry keeps the template tuple and the set of its sources
+        self.index = {}
+        for context, templates in stat_only.items():
+            self.index[(context, True)] = (tuple(templates), frozenset(t.source for t in templates))
+        for context, templates in any_type.items():
+            self.index[(context, False)] = (tuple(templates), frozenset(t.source for t in templates))
+
+    def pick(self, context, recent, require_stat=False, max_recent=3, rng=random):
+        """Uniformly pick a template not in recent[context]; None if the context has none."""
+        entry = self.index.get((context, require_stat))
+        if entry is None:
+            return None
+        candidates, sources = entry
+
+        history = recent.get(context)
+        if history is None:
+            history = recent[context] = RecentTemplates()
+
+        # Rejection-sample past recent templates; if every candidate is
+        # recent, fall back to the full set.
+        n = len(candidates)
+        exhausted = sum(1 for t in history.counts if t in sources) == len(sources)
+        while True:
+            template = candidates[rng.randrange(n)]
+            if exhausted or template.source not in history:
+                break
+
+        history.push(template.source, max_recent)
+        return template
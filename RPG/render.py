@@ -0,0 +1,162 @@
+import shutil
+import sys
+import textwrap
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import add, ne
+
+# === Frame Rendering ===
+# The split screen (narrative left, menu right) is laid out as a list of
+# rows. The renderer remembers the last frame it drew and only rewrites
+# rows that changed, using ANSI cursor moves, in one write per frame.
+# A new narrative line scrolls every row it spans, so then the frame is
+# simply redrawn; per-row diffs are for menu and status changes under a
+# narrative that stayed put.
+
+CSI = "\033["
+CLEAR = CSI + "H" + CSI + "2J"
+NEXT_ROW = CSI + "K\r\n"  # clear the rest of this row, then go to the start of the next
+GUTTER = 4          # blank columns to the right of each column's text
+DEFAULT_SIZE = (90, 30)  # columns, lines when there is no terminal to ask
+
+# Narrative lines never change once appended and menus repeat, so wrapping
+# is cached per (line, width). Only a frame's new lines reach textwrap.
+WRAP_CACHE_SIZE = 8192
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_line(line, width):
+    return tuple(textwrap.wrap(line, width=width)) or ("",)
+
+@lru_cache(maxsize=256)
+def wrap_block(lines, width):
+    """A whole static menu (a tuple of lines) wrapped once per width."""
+    return tuple(part for line in lines for part in wrap_line(line, width))
+
+def wrap_lines(lines, width):
+    if isinstance(lines, tuple):
+        return wrap_block(lines, width)
+    wrapped = []
+    for line in lines:
+        wrapped.extend(wrap_line(line, width))
+    return wrapped
+
+def layout(history, menu_lines, columns, rows, max_narrative=10, wrap_width=None):
+    """Rows of the split screen for a terminal of `columns` x `rows`."""
+    left_width = columns // 2
+    right_width = columns - left_width
+    width = wrap_width or max(10, min(left_width, right_width) - GUTTER)
+
+    narrative = wrap_lines(history[-max_narrative:], width)
+    menu = wrap_lines(menu_lines, width)
+    height = min(max(len(narrative), len(menu)), rows)
+    # Both columns padded to `height` rows, then joined row by row in C
+    left = list(narrative[:height])
+    left.extend([""] * (height - len(left)))
+    right = list(menu[:height])
+    right.extend([""] * (height - len(right)))
+    return list(map(str.rstrip, map(add, map(str.ljust, left, repeat(left_width)), right)))
+
+class FrameRenderer:
+    """Draws split-screen frames, rewriting only the rows that changed."""
+
+    def __init__(self, stream=None, size=None):
+        self.stream = stream or sys.stdout
+        self.size = size  # fixed (columns, lines); None asks the terminal each frame
+        self.previous = None
+        self.previous_size = None
+        self.previous_tail = None  # the narrative lines the last frame showed
+
+    def invalidate(self):
+        """Something else wrote to the screen; the next frame is a full redraw."""
+        self.previous = None
+
+    def terminal_size(self):
+        if self.size:
+            return self.size
+        size = shutil.get_terminal_size(DEFAULT_SIZE)
+        return size.columns, size.lines
+
+    def render(self, history, menu_lines, max_narrative=10, wrap_width=None):
+        """The escape sequence that turns the last frame into this one."""
+        columns, lines = self.terminal_size()
+        tail = history[-max_narrative:]
+        # keep the bottom row free for the prompt
+        frame = layout(tail, menu_lines, columns, max(1, lines - 1), max_narrative, wrap_width)
+
+        previous = self.previous
+        if previous is None or self.previous_size != (columns, lines) or tail != self.previous_tail:
+            # Nothing to diff against, or the narrative moved and with it every
+            # row it spans: a full redraw, without comparing rows
+            parts = [CLEAR, "\r\n".join(frame)]
+        else:
+            # One flag per row, compared in C; rows past the old frame count as changed
+            changed = list(map(ne, previous, frame))
+            changed.extend([True] * (len(frame) - len(previous)))
+            count = changed.count(True)
+            parts = []
+            if count:
+                first = changed.index(True)
+                last = len(changed) - 1 - changed[::-1].index(True)
+                if 2 * count > last - first + 1:
+                    # Mostly changed: one cursor move, then the span row after row
+                    parts.append(f"{CSI}{first + 1};1H")
+                    parts.append(NEXT_ROW.join(frame[first:last + 1]))
+                    parts.append(CSI + "K")
+                else:
+                    parts.extend(f"{CSI}{i + 1};1H{frame[i]}{CSI}K" for i in compress(range(len(changed)), changed))
+        # Park the cursor under the frame and clear the old prompt, input and any shorter-frame leftovers
+        parts.append(f"{CSI}{len(frame) + 1};1H{CSI}J")
+
+        self.previous = frame
+        self.previous_size = (columns, lines)
+        self.previous_tail = tail
+        return "".join(parts)
+
+    def draw(self, history, menu_lines, max_narrative=10, wrap_width=None):
+        self.stream.write(self.render(history, menu_lines, max_narrative, wrap_width))
+        self.stream.flush()
+
+class Screen:
+    """A session's output: print()-compatible text plus diffed split-screen frames.
+
+    Plain text also invalidates the last frame, since it may have
+    scrolled the screen under it.
+    """
+
+    def __init__(self, stream=None, size=None):
+        self.stream = stream or sys.stdout
+        self.renderer = FrameRenderer(self.stream, size)
+
+    def __call__(self, *args, sep=" ", end="\n"):
+        self.stream.write(sep.join(map(str, args)) + end)
+        self.renderer.invalidate()
+
+    def frame(self, history, menu_lines, max_narrative=10, wrap_width=None):
+        self.renderer.draw(history, menu_lines, max_narrative, wrap_width)
+
+class NullScreen(Screen):
+    """Discards all output, for headless runs of the menus."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, *args, sep=" ", end="\n"):
+        pass
+
+    def frame(self, history, menu_lines, max_narrative=10, wrap_width=None):
+        pass
+
+class TranscriptScreen(Screen):
+    """Writes each frame as plain rows, for reading or diffing a scripted run."""
+
+    def __init__(self, stream, size=DEFAULT_SIZE):
+        self.stream = stream
+        self.size = size
+
+    def __call__(self, *args, sep=" ", end="\n"):
+        self.stream.write(sep.join(map(str, args)) + end)
+
+    def frame(self, history, menu_lines, max_narrative=10, wrap_width=None):
+        columns, lines = self.size
+        rows = layout(history, menu_lines, columns, max(1, lines - 1), max_narrative, wrap_width)
+        self.stream.write("-" * columns + "\n" + "\n".join(rows) + "\n")
@@ -0,0 +1,151 @@
+"""Record a session's inputs and replay them headlessly.
+
+Every random draw in a session comes from its own seeded generator, so
+the starting state plus the sequence of input lines determine everything
+the player saw. A log is therefore:
+
+    header   magic, version, content digest, starting-state snapshot
+    events   one per input line: the line, plus a check word
+
+The check (generator position and a CRC of the new narrative lines and
+stats) lets a replay detect the exact event where it diverged.
+
+    python replay.py lastrun.replay               # replay, verify, show the end state
+    python replay.py lastrun.replay --upto 120    # state just after event 120
+    python replay.py lastrun.replay --profile     # time each action and subsystem
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+import instrument
+from content import content_digest
+from render import NullScreen
+from savegame import snapshot_bytes, state_from_snapshot
+
+import RPGTEST8 as game
+
+MAGIC = b"TRPL"
+REPLAY_VERSION = 2
+HEADER = struct.Struct("<4sH20sI")  # magic, version, content digest, snapshot length
+EVENT = struct.Struct("<HIH")       # generator position, check crc, line length
+STATS = struct.Struct("<BBBBIH")
+
+class ReplayError(ValueError):
+    """A replay log is damaged, or its session did not reproduce."""
+
+def event_check(state, seen):
+    """(generator position, crc of narrative since `seen` entries and the stats)."""
+    history = state.narrative_history
+    new = min(history.count - seen, len(history))
+    crc = zlib.crc32("\n".join(history[len(history) - new:]).encode("utf-8"))
+    crc = zlib.crc32(STATS.pack(state.hunger, state.energy, state.morale, state.current_hour,
+                                state.total_hours, state.current_biome_index), crc)
+    return state.rng.getstate()[1][624], crc
+
+# === Recording ===
+class ActionRecorder:
+    """Appends each input line of a session to a replay log."""
+
+    def __init__(self, path, state):
+        snapshot = snapshot_bytes(state)
+        self.file = open(path, "wb", buffering=0)  # each event goes straight to the OS
+        self.file.write(HEADER.pack(MAGIC, REPLAY_VERSION, content_digest(), len(snapshot)) + snapshot)
+        self.seen = state.narrative_history.count
+
+    def record(self, line, state):
+        data = line.encode("utf-8")[:0xFFFF]
+        position, crc = event_check(state, self.seen)
+        self.seen = state.narrative_history.count
+        self.file.write(EVENT.pack(position, crc, len(data)) + data)
+
+    def close(self):
+        self.file.close()
+
+# === Replay ===
+def read_log(path):
+    """(content digest, snapshot payload, [(line, position, crc), ...])."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ReplayError(f"{path}: not a replay log")
+    magic, version, digest, snapshot_len = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError(f"{path}: not a replay log")
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"{path}: replay version {version}, expected {REPLAY_VERSION}")
+    offset = HEADER.size + snapshot_len
+    snapshot = data[HEADER.size:offset]
+    events = []
+    while offset + EVENT.size <= len(data):
+        position, crc, n = EVENT.unpack_from(data, offset)
+        start = offset + EVENT.size
+        if start + n > len(data):
+            break  # torn final write
+        events.append((data[start:start + n].decode("utf-8"), position, crc))
+        offset = start + n
+    return digest, snapshot, events
+
+def replay(path, upto=None, verify=True):
+    """Re-run a recorded session headlessly; returns (state, events replayed).
+
+    With `upto`, stops just after that many events. With `verify`, raises
+    ReplayError at the first event whose outcome differs from the recording.
+    """
+    digest, snapshot, events = read_log(path)
+    if verify and digest != content_digest():
+        raise ReplayError(f"{path}: recorded with different game content")
+    state = state_from_snapshot(snapshot, game.biome_table)
+    state.out = NullScreen()
+    menu = game.main_menu(state)
+    if instrument.installed:
+        menu = instrument.timed_menu(menu)
+    next(menu)
+    seen = state.narrative_history.count
+    events = events if upto is None else events[:upto]
+    for index, (line, position, crc) in enumerate(events):
+        try:
+            menu.send(line)
+        except StopIteration:
+            if index != len(events) - 1:
+                raise ReplayError(f"{path}: game ended at event {index}, {len(events) - index - 1} early")
+        if verify and event_check(state, seen) != (position, crc):
+            raise ReplayError(f"{path}: diverged at event {index} (input {line!r})")
+        seen = state.narrative_history.count
+    menu.close()
+    return state, len(events)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session.")
+    parser.add_argument("log")
+    parser.add_argument("--upto", type=int, help="stop after this many events")
+    parser.add_argument("--no-verify", action="store_true", help="don't stop on divergence")
+    parser.add_argument("--lines", type=int, default=10, help="narrative lines to show")
+    parser.add_argument("--profile", nargs="?", const="", metavar="JSON",
+                        help="time actions and subsystems; print a table, and dump to JSON if given")
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        profiler = instrument.install(game)
+    start = time.perf_counter()
+    try:
+        state, count = replay(args.log, args.upto, not args.no_verify)
+    except ReplayError as e:
+        sys.exit(f"Replay failed: {e}")
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {count} events in {elapsed * 1000:.1f} ms ({count / elapsed if elapsed else 0:,.0f}/s)")
+    print(f"Biome {state.current_biome['biome_name']}, {state.current_hour:02d}:00, "
+          f"hunger {state.hunger}, energy {state.energy}, morale {state.morale}, "
+          f"status {state.status() or 'playing'}")
+    for line in state.narrative_history[-args.lines:]:
+        print(f"  {line}")
+    if args.profile is not None:
+        print(profiler.table())
+        if args.profile:
+            profiler.dump(args.profile)
+
+if __name__ == "__main__":
+    main()
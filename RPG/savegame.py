@@ -0,0 +1,511 @@
+import os
+import struct
+from operator import attrgetter
+
+from game_state import GameState
+from journal import NarrativeLog
+from narrative import RecentTemplates
+
+# === Save Files ===
+# A save file is a header followed by records. Each record is either a
+# full snapshot ('S') or a delta against the record before it ('D').
+# Loading replays the last snapshot and every delta after it. Every
+# `snapshot_every` saves the file is rewritten as one fresh snapshot, so
+# it stays small. A torn final record (crash mid-write) is ignored.
+#
+# All integers are little-endian. Strings are u16 length + UTF-8.
+#
+# `python savegame.py` checks the format end to end (see the bottom).
+
+MAGIC = b"TRPG"
+SAVE_VERSION = 2  # bump whenever the record layout changes
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<cI")  # kind, payload length
+SNAPSHOT, DELTA = b"S", b"D"
+SNAPSHOT_EVERY = 200
+
+class SaveError(ValueError):
+    """A save file is missing, damaged or from an unknown version."""
+
+# Scalar fields in save order: (attribute or "dict_attr.key", struct code).
+# None is stored as -1 for required_hours.
+SCALARS = (
+    ("current_hour", "B"),
+    ("hours_since_sleep", "I"),
+    ("hours_walked", "H"),
+    ("required_hours", "i"),
+    ("current_biome_index", "B"),
+    ("weather_index", "b"),
+    ("energy", "B"),
+    ("hunger", "B"),
+    ("morale", "B"),
+    ("has_fire", "?"),
+    ("fire_hours_remaining", "i"),
+    ("total_hours", "I"),
+    ("reached_summit", "?"),
+    ("visual_xp", "d"),
+    ("auditory_xp", "d"),
+    ("visual_level", "H"),
+    ("auditory_level", "H"),
+    ("player_perception.visual", "B"),
+    ("player_perception.auditory", "B"),
+    ("perception_xp.visual", "d"),
+    ("perception_xp.auditory", "d"),
+    ("perception_wait_flags.visual", "?"),
+    ("perception_wait_flags.auditory", "?"),
+)
+SCALAR_STRUCT = struct.Struct("<" + "".join(code for _, code in SCALARS))
+FIELD_STRUCTS = tuple(struct.Struct("<" + code) for _, code in SCALARS)
+MASK = struct.Struct("<IB")  # changed scalars, changed sections
+
+# Delta section flags
+CAUSE, INVENTORY, IDENTIFIED, COOKED, RECENT, NARRATIVE, RNG_WORDS = (1 << i for i in range(7))
+
+RNG_WORDS_STRUCT = struct.Struct("<624I")
+RNG_TAIL = struct.Struct("<H?d")  # position, has gauss_next, gauss_next
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+I32 = struct.Struct("<i")
+
+def field_getter(name):
+    if "." in name:
+        attr, key = name.split(".")
+        return lambda state: getattr(state, attr)[key]
+    return attrgetter(name)
+
+SCALAR_GETTERS = tuple(field_getter(name) for name, _ in SCALARS)
+
+def scalar_values(state):
+    values = [get(state) for get in SCALAR_GETTERS]
+    if values[3] is None:
+        values[3] = -1
+    return tuple(values)
+
+def set_scalar(state, index, value):
+    name = SCALARS[index][0]
+    if index == 3 and value == -1:
+        value = None
+    if "." in name:
+        attr, key = name.split(".")
+        getattr(state, attr)[key] = value
+    else:
+        setattr(state, name, value)
+
+# --- Encoding helpers ---
+def pack_str(parts, text):
+    data = text.encode("utf-8")
+    parts.append(U16.pack(len(data)))
+    parts.append(data)
+
+def pack_strs(parts, texts):
+    texts = list(texts)
+    parts.append(U16.pack(len(texts)))
+    for text in texts:
+        pack_str(parts, text)
+
+class Reader:
+    """Cursor over a record payload."""
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def take(self, st):
+        values = st.unpack_from(self.data, self.offset)
+        self.offset += st.size
+        return values
+
+    def string(self):
+        (n,) = self.take(U16)
+        text = bytes(self.data[self.offset:self.offset + n]).decode("utf-8")
+        self.offset += n
+        return text
+
+    def strings(self):
+        (n,) = self.take(U16)
+        return [self.string() for _ in range(n)]
+
+# --- What a save compares against ---
+def capture(state):
+    """Plain values for everything a save covers, to diff the next save against."""
+    _version, internal, gauss = state.rng.getstate()
+    return {
+        "scalars": scalar_values(state),
+        "cause": state.cause_of_death or "",
+        "inventory": dict(state.inventory),
+        "identified": frozenset(state.identified_items),
+        "cooked": frozenset(state.cooked_items),
+        "recent": {ctx: tuple(h.order) for ctx, h in state.recent_templates.items()},
+        "narrative": state.narrative_history.count,
+        "rng_words": internal[:624],
+        "rng_pos": internal[624],
+        "gauss": gauss,
+    }
+
+def pack_recent(parts, recent):
+    parts.append(U16.pack(len(recent)))
+    for context, order in recent.items():
+        pack_str(parts, context)
+        pack_strs(parts, order)
+
+def pack_rng_tail(parts, snap):
+    gauss = snap["gauss"]
+    parts.append(RNG_TAIL.pack(snap["rng_pos"], gauss is not None, gauss or 0.0))
+
+def encode_snapshot(state, snap):
+    parts = [SCALAR_STRUCT.pack(*snap["scalars"])]
+    pack_str(parts, snap["cause"])
+    parts.append(U16.pack(len(snap["inventory"])))
+    for name, qty in snap["inventory"].items():
+        pack_str(parts, name)
+        parts.append(I32.pack(qty))
+    pack_strs(parts, sorted(snap["identified"]))
+    pack_strs(parts, sorted(snap["cooked"]))
+    pack_recent(parts, snap["recent"])
+    parts.append(U32.pack(snap["narrative"]))
+    pack_strs(parts, state.narrative_history)
+    parts.append(RNG_WORDS_STRUCT.pack(*snap["rng_words"]))
+    pack_rng_tail(parts, snap)
+    return b"".join(parts)
+
+def encode_delta(state, last, snap):
+    """Payload of a delta from `last` to `snap`; None when nothing changed."""
+    parts = []
+    changed = 0
+    for i, (old, new) in enumerate(zip(last["scalars"], snap["scalars"])):
+        if old != new:
+            changed |= 1 << i
+            parts.append(FIELD_STRUCTS[i].pack(new))
+    sections = 0
+    if snap["cause"] != last["cause"]:
+        sections |= CAUSE
+        pack_str(parts, snap["cause"])
+    if snap["inventory"] != last["inventory"]:
+        sections |= INVENTORY
+        old, new = last["inventory"], snap["inventory"]
+        changes = [(name, qty) for name, qty in new.items() if old.get(name) != qty]
+        changes += [(name, -1) for name in old if name not in new]
+        parts.append(U16.pack(len(changes)))
+        for name, qty in changes:
+            pack_str(parts, name)
+            parts.append(I32.pack(qty))
+    for flag, key in ((IDENTIFIED, "identified"), (COOKED, "cooked")):
+        if snap[key] != last[key]:
+            sections |= flag
+            pack_strs(parts, sorted(snap[key] - last[key]))
+            pack_strs(parts, sorted(last[key] - snap[key]))
+    if snap["recent"] != last["recent"]:
+        sections |= RECENT
+        pack_recent(parts, snap["recent"])
+    if snap["narrative"] != last["narrative"]:
+        sections |= NARRATIVE
+        new_lines = min(snap["narrative"] - last["narrative"], len(state.narrative_history))
+        pack_strs(parts, state.narrative_history[len(state.narrative_history) - new_lines:])
+    if snap["rng_words"] != last["rng_words"]:
+        # The generator refills all 624 words every 624 draws; in between only the position moves
+        sections |= RNG_WORDS
+        parts.append(RNG_WORDS_STRUCT.pack(*snap["rng_words"]))
+    if not (changed or sections) and (snap["rng_pos"], snap["gauss"]) == (last["rng_pos"], last["gauss"]):
+        return None  # nothing happened since the last save
+    pack_rng_tail(parts, snap)
+    return MASK.pack(changed, sections) + b"".join(parts)
+
+# --- Decoding ---
+def restore_rng(state, words, pos, has_gauss, gauss):
+    state.rng.setstate((3, tuple(words) + (pos,), gauss if has_gauss else None))
+
+def apply_snapshot(state, payload, journal_path=None):
+    r = Reader(payload)
+    for i, value in enumerate(r.take(SCALAR_STRUCT)):
+        set_scalar(state, i, value)
+    state.cause_of_death = r.string() or None
+    (n,) = r.take(U16)
+    state.inventory = {}
+    for _ in range(n):
+        name = r.string()
+        (state.inventory[name],) = r.take(I32)
+    state.identified_items = set(r.strings())
+    state.cooked_items = set(r.strings())
+    state.recent_templates = read_recent(r)
+    (count,) = r.take(U32)
+    state.narrative_history = NarrativeLog(r.strings(), journal_path=journal_path)
+    state.narrative_history.count = count
+    words = r.take(RNG_WORDS_STRUCT)
+    restore_rng(state, words, *r.take(RNG_TAIL))
+    return words
+
+def read_recent(r):
+    recent = {}
+    (n,) = r.take(U16)
+    for _ in range(n):
+        context = r.string()
+        history = recent[context] = RecentTemplates()
+        order = r.strings()
+        for source in order:
+            history.push(source, len(order))
+    return recent
+
+def apply_delta(state, payload, words):
+    r = Reader(payload)
+    changed, sections = r.take(MASK)
+    for i, st in enumerate(FIELD_STRUCTS):
+        if changed & (1 << i):
+            set_scalar(state, i, r.take(st)[0])
+    if sections & CAUSE:
+        state.cause_of_death = r.string() or None
+    if sections & INVENTORY:
+        (n,) = r.take(U16)
+        for _ in range(n):
+            name = r.string()
+            (qty,) = r.take(I32)
+            if qty < 0:
+                state.inventory.pop(name, None)
+            else:
+                state.inventory[name] = qty
+    for flag, attr in ((IDENTIFIED, "identified_items"), (COOKED, "cooked_items")):
+        if sections & flag:
+            items = getattr(state, attr)
+            items.update(r.strings())
+            items.difference_update(r.strings())
+    if sections & RECENT:
+        state.recent_templates = read_recent(r)
+    if sections & NARRATIVE:
+        state.narrative_history.extend(r.strings())
+    if sections & RNG_WORDS:
+        words = r.take(RNG_WORDS_STRUCT)
+    restore_rng(state, words, *r.take(RNG_TAIL))
+    return words
+
+# === Saving ===
+class SaveFile:
+    """Autosave target for one session: a snapshot, then a delta per save()."""
+
+    def __init__(self, path, state, snapshot_every=SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.file = None
+        self.last = None
+        self.since_snapshot = 0
+        self.snapshot(state)
+
+    def snapshot(self, state):
+        """Rewrite the file as a single snapshot of `state`."""
+        snap = capture(state)
+        payload = encode_snapshot(state, snap)
+        if self.file:
+            self.file.close()
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, SAVE_VERSION) + RECORD.pack(SNAPSHOT, len(payload)) + payload)
+        os.replace(tmp, self.path)
+        self.file = open(self.path, "ab", buffering=0)  # each delta goes straight to the OS
+        self.last = snap
+        self.since_snapshot = 0
+
+    def save(self, state):
+        """Append what changed since the last save."""
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot(state)
+            return
+        snap = capture(state)
+        payload = encode_delta(state, self.last, snap)
+        if payload is None:
+            return
+        self.file.write(RECORD.pack(DELTA, len(payload)) + payload)
+        self.last = snap
+        self.since_snapshot += 1
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+def snapshot_bytes(state):
+    """A standalone snapshot payload of `state`, for embedding elsewhere."""
+    return encode_snapshot(state, capture(state))
+
+def state_from_snapshot(payload, biome_table, journal_path=None):
+    """The GameState a snapshot_bytes() payload describes."""
+    state = GameState(biome_table, journal_path=journal_path)
+    apply_snapshot(state, payload, journal_path)
+    state.current_biome = biome_table[min(state.current_biome_index, len(biome_table) - 1)]
+    return state
+
+def load_game(path, biome_table, journal_path=None):
+    """Rebuild the GameState a save file describes."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise SaveError(f"{path}: {e}") from None
+    if len(data) < HEADER.size:
+        raise SaveError(f"{path}: not a save file")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError(f"{path}: not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"{path}: save version {version}, expected {SAVE_VERSION}")
+
+    view = memoryview(data)
+    state = words = None
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        kind, length = RECORD.unpack_from(data, offset)
+        start = offset + RECORD.size
+        if start + length > len(data):
+            break  # torn final write
+        payload = view[start:start + length]
+        try:
+            if kind == SNAPSHOT:
+                state = GameState(biome_table, journal_path=journal_path)
+                words = apply_snapshot(state, payload, journal_path)
+            elif kind == DELTA and state is not None:
+                words = apply_delta(state, payload, words)
+            else:
+                raise SaveError(f"{path}: unexpected record {kind!r} at byte {offset}")
+        except (struct.error, UnicodeDecodeError) as e:
+            raise SaveError(f"{path}: damaged record at byte {offset}: {e}") from None
+        offset = start + length
+    if state is None:
+        raise SaveError(f"{path}: no snapshot")
+    state.current_biome = biome_table[min(state.current_biome_index, len(biome_table) - 1)]
+    return state
+
+# === Self-check ===
+# python savegame.py — round-trips the format through the cases a save has
+# to survive. Exits non-zero with the failing check's name on a mismatch.
+
+CHECK_BIOMES = [{"biome_name": "First"}, {"biome_name": "Second"}]
+
+def fingerprint(state):
+    """Everything a load must rebuild, including where the generator will go next."""
+    snap = capture(state)
+    snap["history"] = list(state.narrative_history)
+    snap["biome"] = state.current_biome["biome_name"]
+    snap["rng"] = state.rng.getstate()
+    return snap
+
+def next_draws(state, k=5):
+    saved = state.rng.getstate()
+    draws = [state.rng.random() for _ in range(k)] + [state.rng.gauss(0, 1)]
+    state.rng.setstate(saved)
+    return draws
+
+def check_loads_as(path, state, label):
+    loaded = load_game(path, CHECK_BIOMES)
+    assert fingerprint(loaded) == fingerprint(state), label
+    assert next_draws(loaded) == next_draws(state), f"{label}: generator"
+
+def turn(state, i):
+    """One made-up turn touching every part of the format."""
+    state.current_hour = (state.current_hour + 1) % 24
+    state.total_hours += 1
+    state.hunger = max(0, state.hunger - 1)
+    state.required_hours = None if i % 3 == 0 else 10 + i
+    state.inventory[f"item_{i % 4}"] = i % 3  # zero counts are kept, not dropped
+    if i % 5 == 0:
+        state.inventory.pop("tinder", None)
+        state.identified_items.add(f"item_{i % 4}")
+        state.cooked_items.add(f"boiled_item_{i % 4}")
+    if i % 7 == 0:
+        state.identified_items.discard("jerky")
+        state.cooked_items.clear()
+    history = state.recent_templates.setdefault("travel", RecentTemplates())
+    history.push(f"template {i % 4}", 3)
+    state.narrative_history.append(f"Turn {i}: narrative text with ünïcode")
+    for _ in range(i % 4 * 200):  # crosses the generator's 624-word refills now and then
+        state.rng.random()
+    if i % 6 == 0:
+        state.rng.gauss(0, 1)  # leaves a cached gauss_next behind
+    if i == 40:
+        state.current_biome_index = 1
+        state.current_biome = CHECK_BIOMES[1]
+        state.cause_of_death = "exhaustion"
+
+def check_deltas(path):
+    state = GameState(CHECK_BIOMES, seed=1)
+    save = SaveFile(path, state, snapshot_every=15)
+    check_loads_as(path, state, "fresh snapshot")
+    for i in range(60):
+        turn(state, i)
+        save.save(state)
+        check_loads_as(path, state, f"turn {i}")
+    save.save(state)  # nothing changed: no record
+    check_loads_as(path, state, "unchanged save")
+    save.close()
+
+def check_required_hours(path):
+    state = GameState(CHECK_BIOMES, seed=2)
+    save = SaveFile(path, state)
+    for hours in (None, 0, 37, None):
+        state.required_hours = hours
+        save.save(state)
+        assert load_game(path, CHECK_BIOMES).required_hours == hours, hours
+    save.close()
+
+def check_torn_record(path):
+    state = GameState(CHECK_BIOMES, seed=3)
+    save = SaveFile(path, state)
+    for i in range(3):
+        turn(state, i + 1)
+        save.save(state)
+    before = fingerprint(state)
+    turn(state, 4)
+    save.save(state)
+    save.close()
+    with open(path, "rb") as f:
+        data = f.read()
+    for cut in (1, 3, RECORD.size + 1):
+        with open(path, "wb") as f:
+            f.write(data[:-cut])
+        assert fingerprint(load_game(path, CHECK_BIOMES)) == before, f"torn by {cut} bytes"
+
+def expect_save_error(path, data, label):
+    with open(path, "wb") as f:
+        f.write(data)
+    try:
+        load_game(path, CHECK_BIOMES)
+    except SaveError:
+        return
+    raise AssertionError(f"{label} loaded")
+
+def check_rejects(path):
+    SaveFile(path, GameState(CHECK_BIOMES, seed=4)).close()
+    with open(path, "rb") as f:
+        data = f.read()
+    expect_save_error(path, b"XXXX" + data[4:], "wrong magic")
+    expect_save_error(path, HEADER.pack(MAGIC, SAVE_VERSION + 1) + data[HEADER.size:], "newer version")
+    expect_save_error(path, data[:HEADER.size - 1], "short header")
+    expect_save_error(path, data[:HEADER.size], "no snapshot")
+    expect_save_error(path, data[:HEADER.size] + RECORD.pack(DELTA, 0), "delta before any snapshot")
+    expect_save_error(path, data[:HEADER.size] + RECORD.pack(SNAPSHOT, 4) + b"\0\0\0\0", "damaged snapshot")
+    try:
+        load_game(path + ".missing", CHECK_BIOMES)
+    except SaveError:
+        pass
+    else:
+        raise AssertionError("missing file loaded")
+
+def check_snapshot_bytes(path):
+    state = GameState(CHECK_BIOMES, seed=5)
+    for i in range(10):
+        turn(state, i)
+    copy = state_from_snapshot(snapshot_bytes(state), CHECK_BIOMES)
+    assert fingerprint(copy) == fingerprint(state), "snapshot_bytes"
+    assert next_draws(copy) == next_draws(state), "snapshot_bytes: generator"
+
+CHECKS = (check_deltas, check_required_hours, check_torn_record, check_rejects, check_snapshot_bytes)
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "check.trpg")
+        for check in CHECKS:
+            try:
+                check(path)
+            except Exception as e:
+                sys.exit(f"{check.__name__}: FAILED {type(e).__name__}: {e}")
+            print(f"  {check.__name__:<22} ok")
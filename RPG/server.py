@@ -0,0 +1,160 @@
+"""Serve the game to many players from one process.
+
+Each connection gets its own GameState and main_menu generator. Lines are
+read with asyncio instead of a blocking input(), so idle players cost only
+their session's memory. Prompts end with telnet IAC GA ("go ahead"), the
+usual MUD end-of-prompt marker: telnet and MUD clients hide it, and
+scripted clients can read up to it.
+
+    python server.py --port 4000
+    python server.py --unix /tmp/textrpg.sock
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import resource
+
+import instrument
+import RPGTEST8 as game
+from RPGTEST8 import new_game, main_menu
+from render import Screen
+
+GO_AHEAD = b"\xff\xf9"  # telnet IAC GA
+MAX_LINE = 1024         # longest input line accepted
+IDLE_TIMEOUT = 30 * 60  # seconds before an idle session is dropped
+SCREEN_SIZE = (90, 30)  # columns, lines; clients don't report their size
+
+sessions = 0  # connected right now
+session_ids = itertools.count(1)
+server_profile = None  # every finished session's timings, with --profile-dir
+
+class SessionBuffer:
+    """Stream a session's Screen writes into until its next prompt."""
+    __slots__ = ("parts",)
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+def encode(text):
+    # Telnet wants CRLF line endings
+    return text.replace("\n", "\r\n").encode("utf-8")
+
+async def handle_session(reader, writer, idle_timeout=IDLE_TIMEOUT, journal_dir=None, profile_dir=None):
+    global sessions
+    sessions += 1
+    name = f"session-{os.getpid()}-{next(session_ids)}"
+    journal_path = os.path.join(journal_dir, f"{name}.journal.gz") if journal_dir else None
+    state = new_game(journal_path=journal_path)
+    output = SessionBuffer()
+    state.out = Screen(output, SCREEN_SIZE)
+    menu = main_menu(state)
+    profiler = None
+    if profile_dir:
+        # Timed calls record into whichever session is running; a send never awaits
+        profiler = instrument.current = instrument.Profiler()
+        menu = instrument.timed_menu(menu)
+    try:
+        prompt = next(menu)
+        while True:
+            writer.write(encode(output.take() + prompt) + GO_AHEAD)
+            await writer.drain()
+            try:
+                line = await asyncio.wait_for(reader.readline(), idle_timeout)
+            except (asyncio.TimeoutError, ValueError):  # idle, or line over MAX_LINE
+                break
+            if not line:
+                break  # client hung up
+            if profiler:
+                instrument.current = profiler
+            prompt = menu.send(line.decode("utf-8", "replace").rstrip("\r\n"))
+    except StopIteration:
+        # Game over: send the final lines before closing
+        writer.write(encode(output.take()))
+    except ConnectionError:
+        pass
+    finally:
+        menu.close()
+        if journal_path and os.path.exists(journal_path):
+            os.remove(journal_path)  # sessions don't resume, so the journal dies with it
+        sessions -= 1
+        if profiler:
+            profiler.dump(os.path.join(profile_dir, f"{name}.profile.json"))
+            server_profile.merge(profiler)
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+def raise_open_file_limit():
+    """Each session holds a socket; lift the soft fd limit to the hard one."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            return soft
+    return hard
+
+async def serve(host="127.0.0.1", port=4000, unix=None, backlog=1024, idle_timeout=IDLE_TIMEOUT,
+                journal_dir=None, profile_dir=None):
+    async def handler(reader, writer):
+        await handle_session(reader, writer, idle_timeout, journal_dir, profile_dir)
+
+    if unix:
+        server = await asyncio.start_unix_server(handler, path=unix, limit=MAX_LINE, backlog=backlog)
+        where = unix
+    else:
+        server = await asyncio.start_server(handler, host, port, limit=MAX_LINE, backlog=backlog)
+        where = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving on {where}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the game over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--backlog", type=int, default=1024)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--journal-dir", help="keep each session's full narrative here (gzip) while "
+                                              "it lasts; without it only the recent tail is kept")
+    parser.add_argument("--profile-dir", help="time actions and subsystems; write each session's "
+                                              "timings here as JSON and a summary table at exit")
+    args = parser.parse_args()
+
+    global server_profile
+    if args.journal_dir:
+        os.makedirs(args.journal_dir, exist_ok=True)
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+        instrument.install(game)
+        server_profile = instrument.Profiler()
+        server_profile.sessions = 0
+    limit = raise_open_file_limit()
+    print(f"Open file limit: {limit}", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.backlog, args.idle_timeout,
+                          args.journal_dir, args.profile_dir))
+    except KeyboardInterrupt:
+        pass
+    if server_profile and server_profile.sessions:
+        print(f"{server_profile.sessions} sessions")
+        print(server_profile.table())
+        server_profile.dump(os.path.join(args.profile_dir, "server.profile.json"))
+
+if __name__ == "__main__":
+    main()
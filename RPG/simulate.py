@@ -0,0 +1,229 @@
+"""Headless game engine and batch runner for balancing.
+
+Plays complete games with no terminal I/O, driven by scripted policies,
+and fans seeded games out over a process pool:
+
+    python simulate.py --games 5000 --policy survivor --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import RPGTEST8 as game
+
+# === Engine API ===
+def eat_action(state, item_name):
+    state.narrative_history.extend(game.eat(state, item_name))
+    state.narrative_history.append(game.narrative_from_template(state, "eat", game.current_state(state)))
+
+def fire_action(state, tool="flint_and_steel"):
+    return game.start_fire(state, tool)[0]
+
+ACTIONS = {
+    "travel": game.travel,
+    "forage": game.forage,
+    "eat": eat_action,            # item_name
+    "rest": game.wait_hours,      # hours
+    "sleep": game.sleep_hours,    # hours
+    "fire": fire_action,          # tool
+    "tend": game.tend_fire,
+    "cook": game.cook,            # raw_item, method
+}
+
+def act(state, action, *args):
+    """Perform one action, exactly as the menus would without the prompts."""
+    return ACTIONS[action](state, *args)
+
+def observe(state):
+    """The state a policy gets to see."""
+    return {
+        "hunger": state.hunger,
+        "energy": state.energy,
+        "morale": state.morale,
+        "hour": state.current_hour,
+        "hours_since_sleep": state.hours_since_sleep,
+        "has_fire": state.has_fire,
+        "biome_index": state.current_biome_index,
+        "inventory": state.inventory,
+        "identified": state.identified_items,
+        "items": game.ITEM_DATA,
+    }
+
+# === Policies ===
+# A policy maps (observation, rng) to (action, args).
+
+def edible_items(obs, identified_only=True):
+    # Straight from the catalog's columns: policies run every turn
+    items = obs["items"]
+    rows = items.rows
+    hunger, edible_raw, requires_cooking = (
+        items.columns[field] for field in ("hunger", "edible_raw", "requires_cooking"))
+    food = []
+    for name, qty in obs["inventory"].items():
+        if qty <= 0 or (identified_only and name not in obs["identified"]):
+            continue
+        row = rows.get(name)
+        if row is not None:
+            edible = hunger[row] > 0 and (edible_raw[row] or requires_cooking[row])
+        elif name in items:  # a cooked variant
+            item = items[name]
+            edible = item["hunger"] > 0 and (item["edible_raw"] or item["requires_cooking"])
+        else:
+            continue
+        if edible:
+            food.append(name)
+    return food
+
+def traveler(obs, rng):
+    """Walk until something gives out."""
+    return "travel", ()
+
+def survivor(obs, rng):
+    """Keep stats up with food and sleep, then walk."""
+    if obs["energy"] < 30:
+        return "sleep", (8,)
+    if obs["hunger"] < 50:
+        food = edible_items(obs)
+        if food:
+            return "eat", (max(food, key=lambda n: obs["items"].value(n, "hunger")),)
+        return "forage", ()
+    raw = [n for n, q in obs["inventory"].items()
+           if q > 0 and n in obs["items"] and obs["items"].value(n, "requires_cooking")]
+    if raw:
+        # Cooking needs a lit fire, as in the fire menu
+        if obs["has_fire"]:
+            return "cook", (raw[0], "boiled")
+        if obs["inventory"].get("flint_and_steel", 0) > 0:
+            return "fire", ()
+    return "travel", ()
+
+def wanderer(obs, rng):
+    """Random actions, weighted towards travel."""
+    roll = rng.random()
+    if roll < 0.5:
+        return "travel", ()
+    if roll < 0.65:
+        return "forage", ()
+    if roll < 0.8:
+        food = edible_items(obs, identified_only=False)
+        if food:
+            return "eat", (rng.choice(food),)
+        return "forage", ()
+    if roll < 0.9:
+        return "rest", (rng.randint(1, 4),)
+    return "sleep", (rng.randint(4, 9),)
+
+POLICIES = {"traveler": traveler, "survivor": survivor, "wanderer": wanderer}
+
+# === Games ===
+def play(seed, policy="survivor", max_actions=2000):
+    """Play one full game headlessly. Returns a result summary dict."""
+    state = game.new_game(seed)
+    choose = POLICIES[policy]
+    rng = random.Random(seed ^ 0x5EED)  # policy randomness, separate from the game's
+    hours_per_biome = Counter()
+    actions = 0
+    status = None
+
+    while actions < max_actions:
+        status = state.status()
+        if status:
+            break
+        biome = state.current_biome_index
+        before = state.total_hours
+        action, args = choose(observe(state), rng)
+        act(state, action, *args)
+        hours_per_biome[biome] += state.total_hours - before
+        actions += 1
+    else:
+        status = state.status() or "timeout"
+
+    return {
+        "seed": seed,
+        "outcome": status,
+        "survived": status == "summit",
+        "hours": state.total_hours,
+        "actions": actions,
+        "biomes_reached": state.current_biome_index + 1,
+        "hours_per_biome": dict(hours_per_biome),
+    }
+
+def play_many(seeds, policy, max_actions):
+    """Run a chunk of games in this process; also returns CPU seconds used."""
+    start = time.process_time()
+    results = [play(seed, policy, max_actions) for seed in seeds]
+    return results, time.process_time() - start
+
+# === Runner ===
+def chunked(seq, size):
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+def run_batch(games=1000, policy="survivor", workers=None, base_seed=0, max_actions=2000, chunk=50):
+    """Fan seeded games out over a process pool and aggregate the results."""
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(base_seed, base_seed + games))
+    start = time.perf_counter()
+    results, cpu = [], 0.0
+    if workers == 1:
+        results, cpu = play_many(seeds, policy, max_actions)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_many, part, policy, max_actions) for part in chunked(seeds, chunk)]
+            for future in futures:
+                part_results, part_cpu = future.result()
+                results.extend(part_results)
+                cpu += part_cpu
+    wall = time.perf_counter() - start
+    return summarize(results, wall, cpu, workers)
+
+def summarize(results, wall, cpu, workers):
+    n = len(results)
+    outcomes = Counter(r["outcome"] for r in results)
+    biome_hours = Counter()
+    biome_visits = Counter()
+    for r in results:
+        for biome, hours in r["hours_per_biome"].items():
+            biome_hours[biome] += hours
+            biome_visits[biome] += 1
+    return {
+        "games": n,
+        "workers": workers,
+        "survival_rate": sum(r["survived"] for r in results) / n if n else 0.0,
+        "outcomes": dict(outcomes),
+        "mean_hours": sum(r["hours"] for r in results) / n if n else 0.0,
+        "mean_hours_per_biome": {
+            game.biome_table[b]["biome_name"]: biome_hours[b] / biome_visits[b] for b in sorted(biome_visits)
+        },
+        "wall_seconds": wall,
+        "games_per_sec": n / wall if wall else 0.0,
+        "games_per_sec_per_core": n / cpu if cpu else 0.0,
+    }
+
+def print_summary(summary, policy):
+    print(f"\n== {summary['games']} games, policy '{policy}', {summary['workers']} worker(s) ==")
+    print(f"  survival rate     : {summary['survival_rate']:.1%}")
+    print(f"  mean hours        : {summary['mean_hours']:.1f}")
+    print("  outcomes          : " + ", ".join(f"{k} {v}" for k, v in sorted(summary["outcomes"].items())))
+    print("  hours per biome (mean over games that entered it):")
+    for biome, hours in summary["mean_hours_per_biome"].items():
+        print(f"    {biome:<28} {hours:6.1f}")
+    print(f"  throughput        : {summary['games_per_sec']:.0f} games/sec, "
+          f"{summary['games_per_sec_per_core']:.0f} games/sec per core")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless games for balancing.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="survivor")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--max-actions", type=int, default=2000)
+    args = parser.parse_args()
+
+    summary = run_batch(args.games, args.policy, args.workers, args.seed, args.max_actions)
+    print_summary(summary, args.policy)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import csv
+
+# === Lightweight CSV tables ===
+# The game only reads a handful of small CSVs, so rows are kept as plain
+# dicts. pandas is imported only if something asks for a DataFrame.
+
+class Table:
+    """CSV rows as a list of dicts, with their column names."""
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows):
+        self.columns = list(columns)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def to_dataframe(self):
+        """pandas DataFrame of this table, for optional analytics."""
+        import pandas as pd
+        return pd.DataFrame(self.rows, columns=self.columns)
+
+def load_table(path, converters=None):
+    """Read a CSV into a Table; `converters` maps column name -> callable(str)."""
+    converters = converters or {}
+    with open(path, newline='', encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        columns = reader.fieldnames or []
+    for name, convert in converters.items():
+        for row in rows:
+            row[name] = convert(row[name])
+    return Table(columns, rows)
@@ -0,0 +1,102 @@
+from bisect import bisect
+from itertools import repeat
+
+# === Weather Sampling ===
+# Each biome's weather distribution becomes a Vose alias table when the
+# content is loaded: a draw is one random() and two tuple reads, however
+# many weather types there are.
+#
+# Scaled by n, a uniform u lands in column int(u * n), which keeps its own
+# outcome below i + prob[i] and gives its alias above. So the table is also
+# 2n sorted breakpoints with one outcome per segment, and bulk draws map
+# each uniform with a single C-level bisect over them: the same outcome a
+# single draw gives, at random.choices speed without its per-call setup.
+#
+# With persistence p > 0 the weather is a first-order Markov chain: the
+# next hour keeps the current weather with extra probability p, otherwise
+# it is drawn from the biome's distribution,
+#
+#     P(next = j | now = i) = p * [i == j] + (1 - p) * weights[j]
+#
+# which leaves the long-run frequencies equal to the biome's weights. One
+# uniform u per hour decides both: u < p keeps the weather, otherwise
+# (u - p) / (1 - p) is a fresh uniform for the table.
+
+class AliasTable:
+    """Constant-time sampling from fixed weights (Vose's alias method).
+
+    Draws return items of `outcomes` (by default the indexes 0..n-1).
+    """
+    __slots__ = ("prob", "keep", "other", "bounds", "segments")
+
+    def __init__(self, weights, outcomes=None):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("alias table needs positive weights")
+        outcomes = tuple(range(n) if outcomes is None else outcomes)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding
+        self.prob = tuple(prob)      # chance column i keeps its own outcome
+        self.keep = outcomes         # column i's own outcome
+        self.other = tuple(outcomes[a] for a in alias)  # column i's alias
+        # Breakpoints on u * n: i + prob[i], then i + 1, for every column.
+        # bisect() counts the breakpoints at or below a value, which picks
+        # segment 2i (keep) or 2i + 1 (alias) exactly where draw() does;
+        # the last outcome repeats for a value rounded up to n.
+        self.bounds = tuple(b for i, p in enumerate(prob) for b in (i + p, i + 1.0))
+        self.segments = tuple(o for pair in zip(self.keep, self.other) for o in pair) + (self.other[-1],)
+
+    def draw(self, rng):
+        # One random() picks the column (integer part) and the coin (fraction)
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return self.keep[i] if u < i + self.prob[i] else self.other[i]
+
+    def draw_many(self, rng, k):
+        random = rng.random
+        n = len(self.prob)
+        bounds, segments = self.bounds, self.segments
+        return [segments[bisect(bounds, random() * n)] for _ in repeat(None, k)]
+
+    def probabilities(self):
+        """outcome -> probability, recovered from the table's columns."""
+        n = len(self.prob)
+        p = dict.fromkeys(self.keep, 0.0)
+        for i in range(n):
+            p[self.keep[i]] += self.prob[i] / n
+            p[self.other[i]] += (1.0 - self.prob[i]) / n
+        return p
+
+def draw_chain(table, persistence, previous, rng, k):
+    """k hours of the persistence chain over `table`, after `previous`.
+
+    previous is the last hour's outcome, or None before the first hour
+    (which is then a plain draw). One random() per hour.
+    """
+    random = rng.random
+    bounds, segments = table.bounds, table.segments
+    n = len(table.prob)
+    scale = n / (1.0 - persistence)  # (u - p) / (1 - p), already scaled by n
+    draws = []
+    append = draws.append
+    if previous is None and k > 0:
+        previous = segments[bisect(bounds, random() * n)]
+        append(previous)
+        k -= 1
+    for _ in repeat(None, k):
+        u = random()
+        if u >= persistence:
+            previous = segments[bisect(bounds, (u - persistence) * scale)]
+        append(previous)
+    return draws